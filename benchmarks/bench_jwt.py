@@ -0,0 +1,47 @@
+"""
+Per-request cost of verifying a bearer token, with and without the
+verified-token cache, for each HMAC algorithm `ALGORITHM` may be set to.
+
+    python -m benchmarks.bench_jwt
+"""
+
+from timeit import repeat
+
+from fast_zero import security
+
+ALGORITHMS = ("HS256", "HS384", "HS512")
+NUMBER = 10_000
+
+
+def best_of(stmt) -> float:
+    return min(repeat(stmt, number=NUMBER, repeat=5)) / NUMBER
+
+
+def main():
+    original_algorithm = security.ALGORITHM
+
+    print(f"{'algorithm':<10}{'verify':>12}{'cached':>12}{'saved':>12}")
+    for algorithm in ALGORITHMS:
+        security.ALGORITHM = algorithm
+        token = security.create_acess_token({"sub": "1", "ver": 0})
+
+        def uncached():
+            security.token_cache.clear()
+            security.decode_access_token(token)
+
+        def cached():
+            security.decode_access_token(token)
+
+        verify = best_of(uncached)
+        hit = best_of(cached)
+        print(
+            f"{algorithm:<10}{verify * 1e6:>10.1f}us{hit * 1e6:>10.1f}us"
+            f"{(verify - hit) * 1e6:>10.1f}us"
+        )
+
+    security.ALGORITHM = original_algorithm
+    security.token_cache.clear()
+
+
+if __name__ == "__main__":
+    main()
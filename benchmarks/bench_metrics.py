@@ -0,0 +1,76 @@
+"""
+Per-request overhead of MetricsMiddleware, measured by calling a minimal
+FastAPI app directly over ASGI with and without the middleware.
+
+    python -m benchmarks.bench_metrics
+"""
+
+import asyncio
+from time import perf_counter
+
+from fastapi import FastAPI
+
+from fast_zero.metrics import MetricsMiddleware
+
+REQUESTS = 20_000
+ROUNDS = 5
+
+plain = FastAPI()
+
+
+@plain.get("/")
+def read_root() -> dict[str, str]:
+    return {"message": "Hello World!"}
+
+
+instrumented = MetricsMiddleware(plain)
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def scope() -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+
+
+async def per_request(app) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started_at = perf_counter()
+        for _ in range(REQUESTS):
+            await app(scope(), receive, send)
+        best = min(best, (perf_counter() - started_at) / REQUESTS)
+    return best
+
+
+async def main():
+    without = await per_request(plain)
+    with_metrics = await per_request(instrumented)
+
+    print(f"without middleware: {without * 1e6:8.1f} us/request")
+    print(f"with middleware:    {with_metrics * 1e6:8.1f} us/request")
+    print(
+        f"overhead:           {(with_metrics - without) * 1e6:8.1f} us/request"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
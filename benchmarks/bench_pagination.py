@@ -0,0 +1,110 @@
+"""
+Latency of one todo page deep into a large list, using OFFSET and
+using the keyset cursor.
+
+    BENCH_DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_pagination
+
+Without BENCH_DATABASE_URL a temporary SQLite file is used.
+"""
+
+import asyncio
+import os
+import tempfile
+from time import perf_counter
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from fast_zero.models import Todo, TodoState, User, table_registry
+from fast_zero.pagination import encode_cursor, paginate
+from fast_zero.schemas import PaginationFilter
+
+DEPTH = 100_000
+LIMIT = 100
+ROUNDS = 20
+SEED_BATCH = 10_000
+
+
+async def seed(session: AsyncSession) -> int:
+    user = User(username="bench", password="bench", email="bench@test.com")
+    session.add(user)
+    await session.flush()
+
+    for start in range(0, DEPTH + LIMIT, SEED_BATCH):
+        await session.execute(
+            insert(Todo),
+            [
+                {
+                    "title": f"todo {n}",
+                    "description": "benchmark",
+                    "state": TodoState.todo,
+                    "user_id": user.id,
+                }
+                for n in range(start, start + SEED_BATCH)
+            ],
+        )
+    await session.commit()
+
+    return user.id
+
+
+async def page_latency(
+    session: AsyncSession, user_id: int, pagination_filter: PaginationFilter
+) -> float:
+    query = paginate(
+        select(Todo).where(Todo.user_id == user_id),
+        Todo.id,
+        pagination_filter,
+    )
+
+    timings = []
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        todos = (await session.scalars(query)).all()
+        timings.append(perf_counter() - start)
+        session.expunge_all()
+
+    assert len(todos) == LIMIT
+    return sorted(timings)[len(timings) // 2]
+
+
+async def main():
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if url is None:
+        directory = tempfile.mkdtemp()
+        url = f"sqlite+aiosqlite:///{directory}/bench_pagination.db"
+
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        user_id = await seed(session)
+        last_seen_id = await session.scalar(
+            select(Todo.id)
+            .where(Todo.user_id == user_id)
+            .order_by(Todo.id)
+            .offset(DEPTH - 1)
+        )
+
+        offset = await page_latency(
+            session, user_id, PaginationFilter(offset=DEPTH, limit=LIMIT)
+        )
+        cursor = await page_latency(
+            session,
+            user_id,
+            PaginationFilter(cursor=encode_cursor(last_seen_id), limit=LIMIT),
+        )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+    await engine.dispose()
+
+    print(f"page of {LIMIT} at position {DEPTH} (median of {ROUNDS})")
+    print(f"offset: {offset * 1e3:8.2f} ms")
+    print(f"cursor: {cursor * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+CPU cost of serializing one todo list page: ORM objects validated through
+`TodoList` and encoded with the stdlib, against the selected rows handed
+straight to orjson.
+
+    python -m benchmarks.bench_responses
+"""
+
+from timeit import repeat
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from fast_zero.models import Todo, TodoState, User, table_registry
+from fast_zero.routes.todos import TODO_PUBLIC_COLUMNS
+from fast_zero.schemas import TodoList
+
+PAGE_SIZES = (10, 100, 1_000)
+NUMBER = 200
+
+
+def best_of(stmt) -> float:
+    return min(repeat(stmt, number=NUMBER, repeat=5)) / NUMBER
+
+
+def main():
+    engine = create_engine("sqlite://")
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        user = User(username="bench", password="bench", email="bench@test.com")
+        session.add(user)
+        session.flush()
+        session.execute(
+            insert(Todo),
+            [
+                {
+                    "title": f"todo {n}",
+                    "description": "benchmark " * 10,
+                    "state": TodoState.todo,
+                    "user_id": user.id,
+                }
+                for n in range(max(PAGE_SIZES))
+            ],
+        )
+
+        print(f"{'page':>6}{'validated':>14}{'rows':>12}{'speedup':>10}")
+        for size in PAGE_SIZES:
+            objects = session.scalars(select(Todo).limit(size)).all()
+            rows = session.execute(
+                select(*TODO_PUBLIC_COLUMNS).limit(size)
+            ).all()
+
+            def validated():
+                page = TodoList.model_validate(
+                    {"todos": objects}, from_attributes=True
+                )
+                JSONResponse(page.model_dump(mode="json"))
+
+            def from_rows():
+                ORJSONResponse({
+                    "todos": [row._asdict() for row in rows],
+                    "next_cursor": None,
+                })
+
+            before = best_of(validated)
+            after = best_of(from_rows)
+            print(
+                f"{size:>6}{before * 1e6:>12.1f}us{after * 1e6:>10.1f}us"
+                f"{before / after:>9.1f}x"
+            )
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
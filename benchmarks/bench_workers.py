@@ -0,0 +1,77 @@
+"""
+Throughput of `python -m fast_zero.serve` with one worker against one
+worker per CPU, on the read scenarios of the benchmark suite.
+
+    python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --database postgres --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks.suite import (
+    database_url,
+    format_result,
+    run_scenario,
+    scenarios,
+    seed,
+    uvicorn_server,
+)
+from fast_zero.serve import default_workers
+
+SCENARIOS = ("read_todo", "list_todos_deep_cursor")
+
+
+async def run(args) -> None:
+    with database_url(args.database) as url:
+        credentials = await seed(url, args.seed_todos)
+
+        for workers in args.workers:
+            with uvicorn_server(url, workers) as base_url:
+                async with httpx.AsyncClient(
+                    base_url=base_url, timeout=30
+                ) as client:
+                    response = await client.post(
+                        "/auth/token",
+                        data={
+                            "username": credentials["email"],
+                            "password": credentials["password"],
+                        },
+                    )
+                    token = response.json()["access_token"]
+                    requests = scenarios(credentials, token)
+
+                    for name in SCENARIOS:
+                        result = await run_scenario(
+                            client,
+                            requests[name],
+                            args.requests,
+                            args.concurrency,
+                        )
+                        print(
+                            f"{workers:>2} workers {name:<24} "
+                            f"{format_result(result)}"
+                        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--database", choices=("sqlite", "postgres"), default="sqlite"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, default_workers()}),
+    )
+    parser.add_argument("--seed-todos", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
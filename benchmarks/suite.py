@@ -0,0 +1,363 @@
+"""
+Throughput and latency benchmarks for the API.
+
+Seeds a database with a benchmark user and a large todo list built from
+`tests/factories.py`, then drives the hot endpoints either in-process
+over ASGI or against a real uvicorn server:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --target uvicorn --database postgres
+    python -m benchmarks.suite --baseline results.json
+    TODOS_CACHE_MAX_SIZE=1024 python -m benchmarks.suite  # cached lists
+
+With --baseline the run is compared scenario by scenario and the exit
+status is 1 when p95 latency or throughput regressed past --tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from statistics import mean, quantiles
+from time import perf_counter
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# fast_zero builds its engine from Settings on import, so the application
+# modules are only imported once DATABASE_URL points at the benchmark
+# database.
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret")
+# The login scenario signs in as one user far faster than the login rate
+# limit allows, and with more requests in flight than verifications may
+# run at once.
+os.environ.setdefault("LOGIN_USERNAME_RATE_PER_MINUTE", "1000000")
+os.environ.setdefault("LOGIN_USERNAME_BURST", "1000000")
+os.environ.setdefault("LOGIN_IP_RATE_PER_MINUTE", "1000000")
+os.environ.setdefault("LOGIN_IP_BURST", "1000000")
+os.environ.setdefault("LOGIN_MAX_CONCURRENT_VERIFICATIONS", "1000000")
+# Every list request after the first would be served from the response
+# cache, so the list scenarios measure the database path unless this is
+# set to measure the cache instead.
+os.environ.setdefault("TODOS_CACHE_MAX_SIZE", "0")
+
+BULK_SIZE = 100
+PAGE_SIZE = 100
+SEED_BATCH = 5_000
+
+
+@contextmanager
+def database_url(kind: str):
+    if kind == "postgres":
+        from testcontainers.postgres import PostgresContainer  # noqa: PLC0415
+
+        with PostgresContainer("postgres:16", driver="psycopg") as postgres:
+            yield postgres.get_connection_url()
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        yield f"sqlite+aiosqlite:///{directory}/benchmark.db"
+
+
+async def seed(url: str, n_todos: int) -> dict:
+    from fast_zero.models import Todo, table_registry  # noqa: PLC0415
+    from tests.factories import TodoFactory, UserFactory  # noqa: PLC0415
+
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    user = UserFactory()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(user)
+        await session.flush()
+
+        for start in range(0, n_todos, SEED_BATCH):
+            batch = TodoFactory.build_batch(
+                min(SEED_BATCH, n_todos - start), user_id=user.id
+            )
+            await session.execute(
+                insert(Todo),
+                [
+                    {
+                        "title": todo.title,
+                        "description": todo.description,
+                        "state": todo.state,
+                        "user_id": todo.user_id,
+                    }
+                    for todo in batch
+                ],
+            )
+        await session.commit()
+
+    await engine.dispose()
+
+    return {"email": user.email, "password": user.clean_password}
+
+
+def scenarios(credentials: dict, token: str) -> dict:
+    auth = {"Authorization": f"Bearer {token}"}
+    login = {
+        "username": credentials["email"],
+        "password": credentials["password"],
+    }
+    bulk = [
+        {"title": f"bulk {n}", "description": "benchmark", "state": "todo"}
+        for n in range(BULK_SIZE)
+    ]
+
+    return {
+        "login": lambda n: ("POST", "/auth/token", {"data": login}),
+        "read_todo": lambda n: (
+            "GET",
+            f"/todos/{n % PAGE_SIZE + 1}",
+            {"headers": auth},
+        ),
+        "list_todos_filtered": lambda n: (
+            "GET",
+            "/todos/",
+            {"headers": auth, "params": {"state": "done", "limit": 100}},
+        ),
+        "list_todos_deep_cursor": lambda n: (
+            "GET",
+            "/todos/",
+            {"headers": auth, "params": {"cursor": deep_cursor(n)}},
+        ),
+        "bulk_create": lambda n: (
+            "POST",
+            "/todos/bulk",
+            {"headers": auth, "json": bulk},
+        ),
+    }
+
+
+def deep_cursor(n: int) -> str:
+    from fast_zero.pagination import encode_cursor  # noqa: PLC0415
+
+    return encode_cursor(1_000 + n % 1_000)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, request, n_requests: int, concurrency: int
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        for n in counter:
+            method, url, kwargs = request(n)
+            started_at = perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(perf_counter() - started_at)
+            if response.status_code >= 400:  # noqa: PLR2004
+                errors += 1
+
+    started_at = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - started_at
+
+    cuts = quantiles(latencies, n=100)
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "throughput_rps": n_requests / elapsed,
+        "mean_ms": mean(latencies) * 1000,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+    }
+
+
+@contextmanager
+def uvicorn_server(url: str, workers: int = 1):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "fast_zero.serve"],
+        env={
+            **os.environ,
+            "DATABASE_URL": url,
+            "SERVER_HOST": "127.0.0.1",
+            "SERVER_PORT": str(port),
+            "SERVER_WORKERS": str(workers),
+        },
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def run(args) -> dict:
+    results = {}
+    with database_url(args.database) as url:
+        os.environ["DATABASE_URL"] = url
+        credentials = await seed(url, args.seed_todos)
+
+        async with client_options(
+            args.target, url, args.workers
+        ) as client_kwargs:
+            async with httpx.AsyncClient(
+                timeout=30, **client_kwargs
+            ) as client:
+                response = await client.post(
+                    "/auth/token",
+                    data={
+                        "username": credentials["email"],
+                        "password": credentials["password"],
+                    },
+                )
+                token = response.json()["access_token"]
+
+                for name, request in scenarios(credentials, token).items():
+                    if args.scenario and name not in args.scenario:
+                        continue
+                    n_requests = (
+                        args.login_requests
+                        if name == "login"
+                        else args.requests
+                    )
+                    results[name] = await run_scenario(
+                        client, request, n_requests, args.concurrency
+                    )
+                    print(f"{name:<24} {format_result(results[name])}")
+
+    return {
+        "meta": {
+            "target": args.target,
+            "workers": args.workers if args.target == "uvicorn" else None,
+            "database": args.database,
+            "seed_todos": args.seed_todos,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": datetime.now(tz=timezone.utc).isoformat(),
+        },
+        "scenarios": results,
+    }
+
+
+@asynccontextmanager
+async def client_options(target: str, url: str, workers: int = 1):
+    if target == "uvicorn":
+        with uvicorn_server(url, workers) as base_url:
+            yield {"base_url": base_url}
+        return
+
+    from fast_zero import database  # noqa: PLC0415
+    from fast_zero.app import app  # noqa: PLC0415
+    from fast_zero.hashing import password_hasher  # noqa: PLC0415
+
+    try:
+        yield {
+            "base_url": "http://benchmark",
+            "transport": httpx.ASGITransport(app=app),
+        }
+    finally:
+        password_hasher.shutdown()
+        await database.engine.dispose()
+
+
+def format_result(result: dict) -> str:
+    return (
+        f"{result['throughput_rps']:9.1f} req/s"
+        f"  p50 {result['p50_ms']:8.2f} ms"
+        f"  p95 {result['p95_ms']:8.2f} ms"
+        f"  p99 {result['p99_ms']:8.2f} ms"
+        f"  errors {result['errors']}"
+    )
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Scenarios whose p95 latency grew or throughput dropped by more than
+    `tolerance` (a fraction) relative to the baseline run.
+    """
+    regressions = []
+    for name, result in current["scenarios"].items():
+        if (before := baseline["scenarios"].get(name)) is None:
+            continue
+
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {before['p95_ms']:.2f} -> "
+                f"{result['p95_ms']:.2f} ms"
+            )
+        if result["throughput_rps"] < before["throughput_rps"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']:.1f} -> "
+                f"{result['throughput_rps']:.1f} req/s"
+            )
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target", choices=("inprocess", "uvicorn"), default="inprocess"
+    )
+    parser.add_argument(
+        "--database", choices=("sqlite", "postgres"), default="sqlite"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="uvicorn workers to start."
+    )
+    parser.add_argument("--seed-todos", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--login-requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--scenario", action="append", help="Run only these scenarios."
+    )
+    parser.add_argument("--output", help="Write the results as JSON here.")
+    parser.add_argument("--baseline", help="Results JSON to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,54 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
-from fast_zero.routes import auth, todos, users
+from fast_zero import database, metrics
+from fast_zero.changes import change_broker
+from fast_zero.hashing import password_hasher
+from fast_zero.profiling import ProfilingMiddleware, profile_engine
+from fast_zero.routes import auth, batch, health, todos, users
 from fast_zero.schemas import Message
+from fast_zero.settings import Settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await change_broker.stop()
+    password_hasher.shutdown()
+    # Runs once in-flight requests have drained, so closing the pooled
+    # connections here ends their sessions cleanly on the server side.
+    for db_engine in (database.engine, *database.replica_router.engines):
+        await db_engine.dispose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(metrics.MetricsMiddleware)
+
+if Settings().SQL_PROFILING:
+    app.add_middleware(
+        ProfilingMiddleware,
+        repeat_threshold=Settings().SQL_PROFILING_REPEAT_THRESHOLD,
+    )
+
+for db_engine in (database.engine, *database.replica_router.engines):
+    metrics.instrument_engine(db_engine)
+    if Settings().SQL_PROFILING:
+        profile_engine(db_engine)
 
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(todos.router)
+app.include_router(health.router)
+app.include_router(batch.router)
 
 
 @app.get("/", response_model=Message)
 def read_root() -> dict[str, str]:
     return {"message": "Hello World!"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics() -> str:
+    return metrics.render()
@@ -0,0 +1,87 @@
+"""
+Picks Argon2 parameters that take about a target time per hash on this
+machine, and prints them as settings:
+
+    python -m fast_zero.calibrate --target-ms 100
+
+Run it on the production hardware and with the worker count the hasher
+will share the CPUs with; the result is a per-deployment trade between
+hash cost and login throughput.
+"""
+
+import argparse
+from time import perf_counter
+from typing import Callable
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+# OWASP's minimum memory for Argon2id, 19 MiB.
+MIN_MEMORY_COST = 19_456
+MAX_TIME_COST = 20
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int) -> float:
+    """
+    Best of three hashes with the given parameters, in seconds.
+    """
+    hasher = Argon2Hasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    timings = []
+    for _ in range(3):
+        started_at = perf_counter()
+        hasher.hash("calibration-password")
+        timings.append(perf_counter() - started_at)
+    return min(timings)
+
+
+def calibrate(
+    target_seconds: float,
+    memory_cost: int = 65_536,
+    parallelism: int = 4,
+    measure: Callable[[int, int, int], float] = measure,
+) -> tuple[int, int]:
+    """
+    `(time_cost, memory_cost)` of the costliest hash within
+    `target_seconds`. Memory is kept and passes are added while they fit;
+    when a single pass is already too slow, memory is halved instead,
+    down to `MIN_MEMORY_COST`.
+    """
+    while (
+        memory_cost > MIN_MEMORY_COST
+        and measure(1, memory_cost, parallelism) > target_seconds
+    ):
+        memory_cost = max(MIN_MEMORY_COST, memory_cost // 2)
+
+    time_cost = 1
+    while (
+        time_cost < MAX_TIME_COST
+        and measure(time_cost + 1, memory_cost, parallelism) <= target_seconds
+    ):
+        time_cost += 1
+
+    return time_cost, memory_cost
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    parser.add_argument(
+        "--memory-cost", type=int, default=65_536, help="Starting KiB."
+    )
+    parser.add_argument("--parallelism", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    time_cost, memory_cost = calibrate(
+        args.target_ms / 1000, args.memory_cost, args.parallelism
+    )
+    elapsed = measure(time_cost, memory_cost, args.parallelism)
+
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+    print(f"# {elapsed * 1000:.1f} ms per hash")
+
+
+if __name__ == "__main__":
+    main()
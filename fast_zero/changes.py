@@ -0,0 +1,312 @@
+import asyncio
+import logging
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+    suppress,
+)
+from http import HTTPStatus
+from math import ceil
+from typing import Protocol
+
+import orjson
+import psycopg
+from fastapi import HTTPException
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    String,
+    cast,
+    event,
+    func,
+    literal,
+    make_url,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.settings import Settings
+
+logger = logging.getLogger("fast_zero.changes")
+
+CHANNEL = "todo_changes"
+MAX_IDS = Settings().CHANGE_FEED_MAX_IDS
+# Tells a subscriber it may have missed changes and should refetch.
+RESYNC = {"event": "resync"}
+
+
+def todo_change(event_type: str, ids: list[int] | None) -> dict:
+    """
+    The change event for a write to `ids`. Writes to many todos, or to
+    unknown ones, become a resync, which also keeps NOTIFY payloads small.
+    """
+    if ids is None or len(ids) > MAX_IDS:
+        return RESYNC
+    return {"event": event_type, "ids": sorted(ids)}
+
+
+class Subscription:
+    """
+    A subscriber's bounded queue of changes. A subscriber too slow to keep
+    up doesn't hold back the others: once its queue is full the pending
+    changes are dropped and it gets a single resync instead.
+    """
+
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(max_size)
+        self.overflowed = False
+
+    def deliver(self, change: dict) -> None:
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self) -> dict:
+        if self.overflowed:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.overflowed = False
+            return RESYNC
+        return await self.queue.get()
+
+
+class ChangeBroker(Protocol):
+    """
+    Fans todo changes out to the subscribers of each user. Changes are
+    handed over with the session that wrote them and only delivered once
+    its transaction commits.
+    """
+
+    async def publish(
+        self, session: AsyncSession, user_id: int, change: dict
+    ) -> None: ...
+
+    def notification(
+        self, user_id: int, event_type: str, todo_id: ColumnElement[int]
+    ) -> ColumnElement | None:
+        """
+        A RETURNING column that publishes the change to each row a write
+        returns from within the write itself, or None when the broker has
+        no way to. Writes carrying it don't `publish` their change.
+        """
+        ...
+
+    async def connect(self) -> None:
+        """
+        Waits until the broker can deliver changes to new subscribers,
+        answering 503 if it can't in time.
+        """
+        ...
+
+    def subscribe(
+        self, user_id: int
+    ) -> AbstractAsyncContextManager[Subscription]: ...
+
+    async def stop(self) -> None: ...
+
+
+class MemoryBroker:
+    """
+    Delivers changes within this process, for SQLite and tests.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.subscribers: dict[int, set[Subscription]] = {}
+
+    async def publish(
+        self, session: AsyncSession, user_id: int, change: dict
+    ) -> None:
+        sync_session = session.sync_session
+        sync_session.info.setdefault(CHANNEL, []).append((user_id, change))
+        if not event.contains(sync_session, "after_commit", self._flush):
+            event.listen(sync_session, "after_commit", self._flush)
+            event.listen(sync_session, "after_soft_rollback", self._discard)
+
+    @staticmethod
+    def notification(
+        user_id: int, event_type: str, todo_id: ColumnElement[int]
+    ) -> ColumnElement | None:
+        return None
+
+    def _flush(self, sync_session) -> None:
+        changes = sync_session.info.pop(CHANNEL, [])
+        connection = sync_session.bind
+        if isinstance(connection, Connection) and connection.in_transaction():
+            # The session joined a transaction it doesn't own, as atomic
+            # batches do, so its commit only released a savepoint. The
+            # changes go out if that transaction commits.
+            event.listen(
+                connection,
+                "commit",
+                lambda _: self._dispatch_all(changes),
+                once=True,
+            )
+            return
+
+        self._dispatch_all(changes)
+
+    @staticmethod
+    def _discard(sync_session, previous_transaction) -> None:
+        sync_session.info.pop(CHANNEL, None)
+
+    def _dispatch_all(self, changes: list[tuple[int, dict]]) -> None:
+        for user_id, change in changes:
+            self.dispatch(user_id, change)
+
+    def dispatch(self, user_id: int, change: dict) -> None:
+        for subscription in self.subscribers.get(user_id, ()):
+            subscription.deliver(change)
+
+    async def connect(self) -> None:
+        pass
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int):
+        subscription = Subscription(self.queue_size)
+        self.subscribers.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            self.subscribers[user_id].discard(subscription)
+            if not self.subscribers[user_id]:
+                del self.subscribers[user_id]
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresBroker(MemoryBroker):
+    """
+    Delivers changes across workers with LISTEN/NOTIFY. The NOTIFY is sent
+    in the writing transaction, so Postgres delivers it on commit and
+    drops it on rollback. Single-row writes send it from their RETURNING
+    clause, keeping them to one statement; other writes `publish` it in a
+    statement of its own. Each worker holds one listening connection,
+    opened for its first subscriber, and dispatches to every subscriber
+    in the process from it, reconnecting whenever it fails.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        queue_size: int = 100,
+        retry_after: float = 1.0,
+        connect_timeout: float = 5.0,
+        channel: str = CHANNEL,
+    ):
+        super().__init__(queue_size)
+        self.channel = channel
+        self.conninfo = (
+            make_url(url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self.retry_after = retry_after
+        self.connect_timeout = connect_timeout
+        self._listening = asyncio.Event()
+        self._listener: asyncio.Task | None = None
+
+    async def publish(
+        self, session: AsyncSession, user_id: int, change: dict
+    ) -> None:
+        payload = orjson.dumps({"user_id": user_id, **change}).decode()
+        await session.execute(select(func.pg_notify(self.channel, payload)))
+
+    def notification(
+        self, user_id: int, event_type: str, todo_id: ColumnElement[int]
+    ) -> ColumnElement:
+        # The payload `publish` would send for `todo_change(event_type,
+        # [todo_id])`, with the id spliced in by Postgres.
+        head = orjson.dumps({"user_id": user_id, "event": event_type})
+        payload = (
+            literal(head[:-1].decode() + ',"ids":[', String)
+            + cast(todo_id, String)
+            + "]}"
+        )
+        return func.pg_notify(self.channel, payload)
+
+    async def connect(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+        try:
+            await asyncio.wait_for(
+                self._listening.wait(), self.connect_timeout
+            )
+        except TimeoutError:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail="Change feed unavailable, try again later",
+                headers={"Retry-After": str(ceil(self.retry_after))},
+            )
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int):
+        await self.connect()
+
+        async with super().subscribe(user_id) as subscription:
+            yield subscription
+
+    async def _listen(self) -> None:
+        reconnecting = False
+        while True:
+            try:
+                await self._listen_once(reconnecting)
+            except Exception:
+                logger.exception("Change feed listener failed")
+
+            self._listening.clear()
+            reconnecting = True
+            await asyncio.sleep(self.retry_after)
+
+    async def _listen_once(self, reconnecting: bool) -> None:
+        async with await psycopg.AsyncConnection.connect(
+            self.conninfo, autocommit=True
+        ) as connection:
+            await connection.execute(f"LISTEN {self.channel}")
+            self._listening.set()
+            if reconnecting:
+                # Whatever was sent while disconnected is lost.
+                for subscriptions in self.subscribers.values():
+                    for subscription in subscriptions:
+                        subscription.deliver(RESYNC)
+
+            async for notify in connection.notifies():
+                self._receive(notify.payload)
+
+    def _receive(self, payload: str) -> None:
+        # Anything may NOTIFY the channel, a bad payload is skipped.
+        try:
+            change = orjson.loads(payload)
+            self.dispatch(change.pop("user_id"), change)
+        except Exception:
+            logger.exception("Ignoring change notification %r", payload)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+            self._listening.clear()
+
+
+def make_broker(url: str) -> ChangeBroker:
+    settings = Settings()
+    if make_url(url).get_backend_name() == "postgresql":
+        return PostgresBroker(
+            url,
+            queue_size=settings.CHANGE_FEED_QUEUE_SIZE,
+            retry_after=settings.CHANGE_FEED_RETRY_SECONDS,
+            connect_timeout=settings.CHANGE_FEED_CONNECT_TIMEOUT_SECONDS,
+        )
+    return MemoryBroker(queue_size=settings.CHANGE_FEED_QUEUE_SIZE)
+
+
+change_broker = make_broker(Settings().DATABASE_URL)
+
+
+def get_change_broker() -> ChangeBroker:
+    return change_broker
@@ -0,0 +1,56 @@
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+
+from starlette.datastructures import Headers
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Strong entity tag for a representation identified by `parts`.
+    """
+    digest = blake2b(
+        "\0".join(map(str, parts)).encode(), digest_size=12
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def http_date(moment: datetime) -> str:
+    """
+    `moment` as an HTTP date. Naive datetimes from the database are UTC.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return format_datetime(moment.astimezone(UTC), usegmt=True)
+
+
+def not_modified(
+    headers: Headers, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    Whether a conditional GET can be answered with 304 Not Modified.
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    """
+    if (if_none_match := headers.get("if-none-match")) is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return any(
+            tag.strip().removeprefix("W/") == etag
+            for tag in if_none_match.split(",")
+        )
+
+    if last_modified is None or (
+        (if_modified_since := headers.get("if-modified-since")) is None
+    ):
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=UTC)
+    return last_modified.replace(microsecond=0) <= since
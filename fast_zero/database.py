@@ -1,10 +1,148 @@
-from typing import AsyncGenerator
+from contextvars import ContextVar
+from itertools import count
+from time import monotonic, perf_counter
+from typing import Annotated, AsyncGenerator, Callable
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from fastapi import Depends
+from sqlalchemy import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from fast_zero.settings import Settings
 
-engine = create_async_engine(Settings().DATABASE_URL)
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that also records how long checkouts waited for a
+    connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started_at = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = perf_counter() - started_at
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+def make_engine(url: str) -> AsyncEngine:
+    """
+    Creates an engine tuned by the DATABASE_* settings. The pool settings
+    only apply to Postgres; other databases keep SQLAlchemy's defaults.
+    """
+    settings = Settings()
+    database_url = make_url(url)
+
+    if database_url.get_backend_name() != "postgresql":
+        return create_async_engine(url)
+
+    connect_args = {}
+    if database_url.get_driver_name() == "psycopg":
+        connect_args["prepare_threshold"] = settings.DATABASE_PREPARE_THRESHOLD
+    if settings.DATABASE_STATEMENT_TIMEOUT_MS is not None:
+        connect_args["options"] = (
+            f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}"
+        )
+
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, int | float] | None:
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedPool):
+        return None
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "checkouts": pool.checkouts,
+        "wait_seconds": pool.wait_seconds,
+        "max_wait_seconds": pool.max_wait_seconds,
+    }
+
+
+class ReplicaRouter:
+    """
+    Balances reads round-robin over the replica engines. A replica that
+    fails its health check is skipped for `retry_after` seconds.
+    """
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        retry_after: float = 30.0,
+        timer: Callable[[], float] = monotonic,
+    ):
+        self.engines = engines
+        self.retry_after = retry_after
+        self._timer = timer
+        self._turn = count()
+        self._down_until: dict[AsyncEngine, float] = {}
+
+    def candidates(self) -> list[AsyncEngine]:
+        """
+        The healthy replicas, starting with the one whose turn it is.
+        """
+        if not self.engines:
+            return []
+
+        start = next(self._turn) % len(self.engines)
+        now = self._timer()
+
+        return [
+            replica
+            for replica in self.engines[start:] + self.engines[:start]
+            if self._down_until.get(replica, 0.0) <= now
+        ]
+
+    def mark_down(self, replica: AsyncEngine) -> None:
+        self._down_until[replica] = self._timer() + self.retry_after
+
+
+engine = make_engine(Settings().DATABASE_URL)
+replica_router = ReplicaRouter(
+    [make_engine(url) for url in Settings().REPLICA_DATABASE_URLS],
+    retry_after=Settings().REPLICA_RETRY_SECONDS,
+)
+
+
+def is_replica(session: AsyncSession) -> bool:
+    """
+    Whether `session` reads from a replica, which may not have caught up
+    with what the primary has committed yet.
+    """
+    return session.bind in replica_router.engines
+
+
+# Set by `POST /batch` while it runs its sub-requests, see `use_session`.
+batch_session: ContextVar[AsyncSession | None] = ContextVar(
+    "batch_session", default=None
+)
 
 
 async def get_session() -> AsyncGenerator[
@@ -12,3 +150,44 @@ async def get_session() -> AsyncGenerator[
 ]:  # pragma: no cover
     async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only routes. Uses the next healthy replica, checking
+    it can hand out a connection first, and falls back to the primary.
+    Batch sub-requests skip the replicas, `use_read_session` hands them
+    the batch's session instead.
+    """
+    replicas = [] if batch_session.get() else replica_router.candidates()
+    for replica in replicas:
+        session = AsyncSession(replica, expire_on_commit=False)
+        try:
+            await session.connection()
+        except (DBAPIError, OSError):
+            await session.close()
+            replica_router.mark_down(replica)
+            continue
+
+        async with session:
+            yield session
+        return
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def use_session(
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> AsyncSession:
+    """
+    The session of the enclosing batch request, if any, so every
+    sub-request of a batch works in one session.
+    """
+    return batch_session.get() or session
+
+
+async def use_read_session(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+) -> AsyncSession:
+    return batch_session.get() or session
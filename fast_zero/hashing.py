@@ -0,0 +1,125 @@
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass
+from functools import partial
+from http import HTTPStatus
+from time import perf_counter
+from typing import Callable, Literal, TypeVar
+
+from fastapi import HTTPException
+
+from fast_zero.security import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_password,
+)
+from fast_zero.settings import Settings
+
+R = TypeVar("R")
+
+
+@dataclass
+class HashMetrics:
+    calls: int = 0
+    rejected: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def observe(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class PasswordHasher:
+    """
+    Runs the Argon2 hashing and verification on a bounded worker pool,
+    so a login storm can't block the event loop.
+
+    At most `workers` calls run at once and up to `max_queue` more wait
+    for a free worker; anything beyond that is rejected with a 503.
+    """
+
+    def __init__(
+        self,
+        executor: Literal["thread", "process"] = "thread",
+        workers: int = 4,
+        max_queue: int = 64,
+    ):
+        self.executor = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self.metrics = HashMetrics()
+        self._executor: Executor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.pending - self.workers)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            verify_password, plain_password, hashed_password
+        )
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(
+            verify_and_update_password, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor == "process":
+                self._executor = ProcessPoolExecutor(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, func: Callable[..., R], *args) -> R:
+        if self.pending >= self.workers + self.max_queue:
+            self.metrics.rejected += 1
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail="Server busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), func, *args)
+        future.add_done_callback(partial(self._release, perf_counter()))
+
+        # The worker keeps running if the request is cancelled, so the
+        # slot is only released once the hash itself is done.
+        return await asyncio.shield(future)
+
+    def _release(self, started_at: float, _future: asyncio.Future) -> None:
+        self.pending -= 1
+        self.metrics.observe(perf_counter() - started_at)
+
+
+password_hasher = PasswordHasher(
+    executor=Settings().PASSWORD_HASH_EXECUTOR,
+    workers=Settings().PASSWORD_HASH_WORKERS,
+    max_queue=Settings().PASSWORD_HASH_MAX_QUEUE,
+)
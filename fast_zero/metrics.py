@@ -0,0 +1,281 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fast_zero import database
+from fast_zero.hashing import password_hasher
+from fast_zero.rate_limit import login_limiter
+from fast_zero.response_cache import todos_cache
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self.values: dict[tuple[tuple[str, str], ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(labels.items())
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[tuple(labels.items())] = value
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, labels, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, buckets: tuple[float, ...]
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        # Per label set: the count of every bucket, then the sum.
+        self.values: dict[tuple[tuple[str, str], ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels.items())
+        if (series := self.values.get(key)) is None:
+            series = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self):
+        for labels, series in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(
+                (*self.buckets, "+Inf"), series[:-1]
+            ):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket",
+                    (*labels, ("le", str(bound))),
+                    cumulative,
+                )
+            yield f"{self.name}_count", labels, cumulative
+            yield f"{self.name}_sum", labels, series[-1]
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being served."
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database statements issued per request.",
+    QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database statements per request.",
+    LATENCY_BUCKETS,
+)
+DB_POOL = Gauge("db_pool_connections", "Primary pool connections by state.")
+DB_POOL_WAIT = Counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for pool checkouts."
+)
+HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Password hashes waiting for a worker."
+)
+HASH_PENDING = Gauge(
+    "password_hash_pending", "Password hashes running or waiting."
+)
+HASH_CALLS = Counter("password_hash_calls_total", "Password hashes completed.")
+HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Password hashes rejected with a 503."
+)
+HASH_SECONDS = Counter(
+    "password_hash_seconds_total", "Time spent on password hashes."
+)
+LOGIN_THROTTLED = Counter(
+    "login_throttled_total", "Login attempts rejected with a 429, by reason."
+)
+TODOS_CACHE_HITS = Counter(
+    "todos_cache_hits_total", "Todo lists served from the response cache."
+)
+TODOS_CACHE_MISSES = Counter(
+    "todos_cache_misses_total", "Todo lists missing from the response cache."
+)
+TODOS_CACHE_HIT_RATIO = Gauge(
+    "todos_cache_hit_ratio", "Share of todo list lookups that hit the cache."
+)
+TODOS_CACHE_BYTES = Gauge(
+    "todos_cache_bytes", "Approximate size of the cached todo lists."
+)
+
+METRICS = [
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    REQUEST_DB_QUERIES,
+    REQUEST_DB_SECONDS,
+    DB_POOL,
+    DB_POOL_WAIT,
+    HASH_QUEUE_DEPTH,
+    HASH_PENDING,
+    HASH_CALLS,
+    HASH_REJECTED,
+    HASH_SECONDS,
+    LOGIN_THROTTLED,
+    TODOS_CACHE_HITS,
+    TODOS_CACHE_MISSES,
+    TODOS_CACHE_HIT_RATIO,
+    TODOS_CACHE_BYTES,
+]
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+request_queries: ContextVar[QueryStats | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, *args):
+    conn.info["query_started_at"] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, *args):
+    started_at = conn.info.pop("query_started_at")
+    if (stats := request_queries.get()) is not None:
+        stats.count += 1
+        stats.seconds += perf_counter() - started_at
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Counts and times the statements `engine` runs for the current request.
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(
+        sync_engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        event.listen(
+            sync_engine, "before_cursor_execute", _before_cursor_execute
+        )
+        event.listen(
+            sync_engine, "after_cursor_execute", _after_cursor_execute
+        )
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request under its route template,
+    together with the database statements it issued.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        queries = QueryStats()
+        token = request_queries.set(queries)
+        REQUESTS_IN_FLIGHT.inc()
+        started_at = perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started_at
+            REQUESTS_IN_FLIGHT.dec()
+            request_queries.reset(token)
+
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            REQUEST_LATENCY.observe(
+                elapsed,
+                method=scope["method"],
+                route=route,
+                status=str(status_code),
+            )
+            REQUEST_DB_QUERIES.observe(queries.count, route=route)
+            REQUEST_DB_SECONDS.observe(queries.seconds, route=route)
+
+
+def _collect() -> None:
+    if (stats := database.pool_stats(database.engine)) is not None:
+        for state in ("checked_in", "checked_out", "overflow"):
+            DB_POOL.set(stats[state], state=state)
+        DB_POOL_WAIT.set(stats["wait_seconds"])
+
+    HASH_QUEUE_DEPTH.set(password_hasher.queue_depth)
+    HASH_PENDING.set(password_hasher.pending)
+    HASH_CALLS.set(password_hasher.metrics.calls)
+    HASH_REJECTED.set(password_hasher.metrics.rejected)
+    HASH_SECONDS.set(password_hasher.metrics.total_seconds)
+
+    LOGIN_THROTTLED.set(login_limiter.limited, reason="rate_limit")
+    LOGIN_THROTTLED.set(login_limiter.saturated, reason="concurrency")
+
+    TODOS_CACHE_HITS.set(todos_cache.hits)
+    TODOS_CACHE_MISSES.set(todos_cache.misses)
+    TODOS_CACHE_HIT_RATIO.set(todos_cache.hit_ratio)
+    TODOS_CACHE_BYTES.set(todos_cache.backend.size_bytes)
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in labels)
+    return f"{{{pairs}}}"
+
+
+def render() -> str:
+    """
+    All metrics in the Prometheus text exposition format.
+    """
+    _collect()
+
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(
+            f"{name}{_format_labels(labels)} {value}"
+            for name, labels, value in metric.samples()
+        )
+
+    return "\n".join(lines) + "\n"
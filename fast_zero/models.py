@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, registry
 
 table_registry = registry()
@@ -21,6 +21,17 @@ class User:
     update_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+    # Bumped by every write to the user's todos, see `routes.todos`.
+    todos_version: Mapped[int] = mapped_column(init=False, server_default="0")
+    # Must match the "ver" claim of access tokens, see `security`.
+    token_version: Mapped[int] = mapped_column(init=False, server_default="0")
+
+
+# Full-text document of a todo, shared by the GIN index and the search
+# queries so Postgres can match one against the other.
+TODO_SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, (title || ' ') || description)"
+)
 
 
 class TodoState(str, Enum):
@@ -34,6 +45,15 @@ class TodoState(str, Enum):
 @table_registry.mapped_as_dataclass
 class Todo:
     __tablename__ = "todos"
+    __table_args__ = (
+        Index("ix_todos_user_id_id", "user_id", "id"),
+        Index("ix_todos_user_id_state_id", "user_id", "state", "id"),
+        Index(
+            "ix_todos_search",
+            text(TODO_SEARCH_DOCUMENT),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
@@ -41,3 +61,12 @@ class Todo:
     state: Mapped[TodoState]
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now(), onupdate=func.now()
+    )
+    version: Mapped[int] = mapped_column(
+        init=False, server_default="1", onupdate=text("version + 1")
+    )
@@ -0,0 +1,50 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from http import HTTPStatus
+from typing import Any, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Select
+from sqlalchemy.orm import InstrumentedAttribute
+
+from fast_zero.schemas import PaginationFilter
+
+
+def encode_cursor(last_id: int) -> str:
+    return urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(urlsafe_b64decode(cursor.encode()).decode())
+    except (Base64Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def paginate(
+    query: Select,
+    id_column: InstrumentedAttribute[int],
+    pagination_filter: PaginationFilter,
+) -> Select:
+    """
+    Orders the query by `id_column` and applies the page window. With a
+    cursor the page starts after the last seen id (keyset pagination),
+    otherwise it falls back to OFFSET.
+    """
+    query = query.order_by(id_column).limit(pagination_filter.limit)
+
+    if pagination_filter.cursor is not None:
+        return query.where(id_column > decode_cursor(pagination_filter.cursor))
+
+    return query.offset(pagination_filter.offset)
+
+
+def next_cursor(
+    rows: Sequence[Any], pagination_filter: PaginationFilter
+) -> str | None:
+    if not rows or len(rows) < pagination_filter.limit:
+        return None
+
+    return encode_cursor(rows[-1].id)
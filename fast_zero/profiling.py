@@ -0,0 +1,134 @@
+import json
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("fast_zero.profiling")
+
+
+@dataclass
+class QueryProfile:
+    statements: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return sum(elapsed for _, elapsed in self.statements)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """
+        Statements issued at least `threshold` times, a sign of N+1 queries.
+        """
+        shapes = Counter(statement for statement, _ in self.statements)
+        return {
+            statement: times
+            for statement, times in shapes.items()
+            if times >= threshold
+        }
+
+
+request_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "request_profile", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, *args):
+    conn.info["profile_started_at"] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, *args):
+    started_at = conn.info.pop("profile_started_at")
+    if (profile := request_profile.get()) is not None:
+        profile.statements.append((statement, perf_counter() - started_at))
+
+
+def profile_engine(engine: AsyncEngine) -> None:
+    """
+    Records every statement `engine` runs into the current request profile.
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(
+        sync_engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        event.listen(
+            sync_engine, "before_cursor_execute", _before_cursor_execute
+        )
+        event.listen(
+            sync_engine, "after_cursor_execute", _after_cursor_execute
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Debug middleware reporting the SQL issued by each request, both in a
+    `Server-Timing` header and in a JSON log line.
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 3):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = request_profile.set(profile)
+        started_at = perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={profile.seconds * 1000:.2f};desc="'
+                    f'{len(profile.statements)} queries", '
+                    f"app;dur={(perf_counter() - started_at) * 1000:.2f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_profile.reset(token)
+            self._log(scope, status_code, profile, perf_counter() - started_at)
+
+    def _log(
+        self,
+        scope: Scope,
+        status_code: int,
+        profile: QueryProfile,
+        elapsed: float,
+    ) -> None:
+        repeated = profile.repeated(self.repeat_threshold)
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(scope.get("route"), "path", None),
+            "status": status_code,
+            "duration_ms": round(elapsed * 1000, 2),
+            "db_ms": round(profile.seconds * 1000, 2),
+            "queries": len(profile.statements),
+            "statements": [
+                {"sql": statement, "ms": round(seconds * 1000, 2)}
+                for statement, seconds in profile.statements
+            ],
+            "repeated": [
+                {"sql": statement, "times": times}
+                for statement, times in repeated.items()
+            ],
+        }
+
+        logger.log(
+            logging.WARNING if repeated else logging.INFO, json.dumps(record)
+        )
@@ -0,0 +1,145 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from http import HTTPStatus
+from math import ceil
+from time import monotonic
+from typing import Callable, Protocol
+
+from fastapi import HTTPException
+
+from fast_zero.cache import TTLCache
+from fast_zero.settings import Settings
+
+
+class RateLimitBackend(Protocol):
+    """
+    Storage for token buckets. The in-process `MemoryBackend` limits each
+    worker on its own; a shared store (a Redis script, say) makes the
+    limits hold across every worker.
+    """
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """
+        Takes a token from the bucket at `key`, refilled at `rate` tokens
+        per second up to `burst`. Returns 0 when a token was taken and
+        otherwise the seconds until one is available.
+        """
+        ...
+
+
+class MemoryBackend:
+    def __init__(
+        self, max_size: int = 10_000, timer: Callable[[], float] = monotonic
+    ):
+        self.buckets: TTLCache[str, tuple[float, float]] = TTLCache(
+            max_size=max_size, timer=timer
+        )
+        self._timer = timer
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = self._timer()
+        tokens, updated_at = self.buckets.get(key) or (burst, now)
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+
+        if tokens < 1:
+            return (1 - tokens) / rate
+
+        # A bucket left alone until it is full again is the same as none.
+        self.buckets.set(key, (tokens - 1, now), ttl=burst / rate)
+        return 0.0
+
+    def clear(self) -> None:
+        self.buckets.clear()
+
+
+@dataclass(frozen=True)
+class Limit:
+    """
+    `burst` attempts at once, refilled at `per_minute`.
+    """
+
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+
+class LoginRateLimiter:
+    """
+    Throttles login attempts before they reach the password hasher: token
+    buckets per username and per client IP, and a cap on verifications
+    running at once. Both answer 429 with a Retry-After header.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        username_limit: Limit,
+        ip_limit: Limit,
+        max_concurrent: int,
+    ):
+        self.backend = backend
+        self.username_limit = username_limit
+        self.ip_limit = ip_limit
+        self.max_concurrent = max_concurrent
+        self.verifying = 0
+        self.limited = 0
+        self.saturated = 0
+
+    async def check(self, username: str, client_ip: str | None) -> None:
+        wait = await self.backend.take(
+            f"login:username:{username.casefold()}",
+            self.username_limit.rate,
+            self.username_limit.burst,
+        )
+        if client_ip is not None:
+            wait = max(
+                wait,
+                await self.backend.take(
+                    f"login:ip:{client_ip}",
+                    self.ip_limit.rate,
+                    self.ip_limit.burst,
+                ),
+            )
+
+        if wait > 0:
+            self.limited += 1
+            raise HTTPException(
+                status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(ceil(wait))},
+            )
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        Holds one of the `max_concurrent` verification slots.
+        """
+        if self.verifying >= self.max_concurrent:
+            self.saturated += 1
+            raise HTTPException(
+                status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        self.verifying += 1
+        try:
+            yield
+        finally:
+            self.verifying -= 1
+
+
+login_limiter = LoginRateLimiter(
+    MemoryBackend(max_size=Settings().LOGIN_RATE_LIMIT_MAX_KEYS),
+    username_limit=Limit(
+        Settings().LOGIN_USERNAME_RATE_PER_MINUTE,
+        Settings().LOGIN_USERNAME_BURST,
+    ),
+    ip_limit=Limit(
+        Settings().LOGIN_IP_RATE_PER_MINUTE, Settings().LOGIN_IP_BURST
+    ),
+    max_concurrent=Settings().LOGIN_MAX_CONCURRENT_VERIFICATIONS,
+)
@@ -0,0 +1,132 @@
+from hashlib import blake2b
+from typing import Protocol
+
+from fast_zero.cache import TTLCache
+from fast_zero.settings import Settings
+
+
+class CacheBackend(Protocol):
+    """
+    Storage for `ResponseCache`. The in-process `MemoryBackend` is the
+    default; a shared store (Redis, memcached) lets every worker see the
+    same entries and generation counters.
+    """
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def get_counter(self, key: str) -> int: ...
+
+    async def incr(self, key: str) -> int: ...
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Approximate size of the stored values, for metrics.
+        """
+        ...
+
+
+class MemoryBackend:
+    def __init__(self, max_size: int = 1024):
+        self.entries: TTLCache[str, bytes] = TTLCache(max_size=max_size)
+        self.counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries.set(key, value, ttl=ttl)
+
+    async def get_counter(self, key: str) -> int:
+        return self.counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(value) for value in self.entries.values())
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.counters.clear()
+
+
+class ResponseCache:
+    """
+    Caches rendered list responses per user and query. Entry keys embed the
+    user's generation counter, so `invalidate` drops every entry of a user
+    in O(1) by bumping it; the orphaned entries age out of the backend.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _generation_key(self, user_id: int) -> str:
+        return f"{self.namespace}:{user_id}:generation"
+
+    async def key(self, user_id: int, query: str) -> str:
+        """
+        Key of the response to `query` for the user's current generation.
+        Take it before reading the database: a write committed afterwards
+        moves the user to a new generation, orphaning what gets stored.
+        """
+        generation = await self.backend.get_counter(
+            self._generation_key(user_id)
+        )
+        digest = blake2b(query.encode(), digest_size=16).hexdigest()
+        return f"{self.namespace}:{user_id}:{generation}:{digest}"
+
+    async def get(self, key: str) -> tuple[str, bytes] | None:
+        """
+        The ETag and body stored under `key`.
+        """
+        if (value := await self.backend.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        etag, body = value.split(b"\n", 1)
+        return etag.decode(), body
+
+    async def set(self, key: str, etag: str, body: bytes) -> None:
+        await self.backend.set(key, etag.encode() + b"\n" + body, self.ttl)
+
+    async def invalidate(self, user_id: int) -> None:
+        """
+        Drops the user's entries. Call after the write commits.
+        """
+        await self.backend.incr(self._generation_key(user_id))
+
+
+def make_backend(settings: Settings) -> CacheBackend:
+    """
+    The in-process backend, which only stores entries when the app runs in
+    a single worker. Each worker would keep its own generation counters, so
+    a write handled by one couldn't invalidate the lists cached by the
+    others, which would keep serving them, and answering 304 for them,
+    until they expire. Caching lists across workers takes a shared backend.
+    """
+    single_worker = settings.SERVER_WORKERS in {None, 1}
+    return MemoryBackend(
+        max_size=settings.TODOS_CACHE_MAX_SIZE if single_worker else 0
+    )
+
+
+todos_cache = ResponseCache(
+    make_backend(Settings()),
+    namespace="todos",
+    ttl=Settings().TODOS_CACHE_TTL_SECONDS,
+)
@@ -1,11 +1,18 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Request
+from sqlalchemy import select, update
 
+from fast_zero.hashing import password_hasher
 from fast_zero.models import User
-from fast_zero.schemas import Token
-from fast_zero.security import create_acess_token, verify_password
+from fast_zero.rate_limit import login_limiter
+from fast_zero.schemas import Message, Token
+from fast_zero.security import (
+    DUMMY_PASSWORD_HASH,
+    create_acess_token,
+    token_payload,
+    user_cache,
+)
 from fast_zero.types.types_app import T_OAuthForm, T_Session
 from fast_zero.types.types_users import T_CurrentUser
 
@@ -16,24 +23,59 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 async def login_for_acess_token(
     form_data: T_OAuthForm,
     session: T_Session,
+    request: Request,
 ) -> dict[str, str]:
+    await login_limiter.check(
+        form_data.username, request.client and request.client.host
+    )
+
     user = await session.scalar(
         select(User).where(User.email == form_data.username)
     )
 
-    if user is None or not verify_password(form_data.password, user.password):
+    async with login_limiter.admit():
+        verified, updated_hash = await password_hasher.verify_and_update(
+            form_data.password,
+            DUMMY_PASSWORD_HASH if user is None else user.password,
+        )
+
+    if user is None or not verified:
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail="Incorrect username or password",
         )
 
-    access_token = create_acess_token(data_payload={"sub": user.email})
+    if updated_hash is not None:
+        await session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(password=updated_hash)
+        )
+        await session.commit()
+        user_cache.invalidate(user.id)
+
+    access_token = create_acess_token(data_payload=token_payload(user))
 
     return {"access_token": access_token, "token_type": "Bearer"}
 
 
 @router.post("/refresh_token", response_model=Token)
 async def refresh_access_token(user: T_CurrentUser) -> dict[str, str]:
-    new_access_token = create_acess_token(data_payload={"sub": user.email})
+    new_access_token = create_acess_token(data_payload=token_payload(user))
 
     return {"access_token": new_access_token, "token_type": "Bearer"}
+
+
+@router.post("/revoke", response_model=Message)
+async def revoke_tokens(
+    user: T_CurrentUser, session: T_Session
+) -> dict[str, str]:
+    await session.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(token_version=User.token_version + 1)
+    )
+    await session.commit()
+    user_cache.invalidate(user.id)
+
+    return {"message": "Tokens revoked"}
@@ -0,0 +1,204 @@
+import logging
+from http import HTTPStatus
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.database import batch_session
+from fast_zero.response_cache import todos_cache
+from fast_zero.schemas import BatchOperation, BatchResult
+from fast_zero.security import user_cache
+from fast_zero.types.types_app import (
+    T_BatchAtomic,
+    T_BatchRequests,
+    T_Session,
+)
+from fast_zero.types.types_users import T_CurrentUser
+
+logger = logging.getLogger("fast_zero.batch")
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+# Sub-requests never carry their own credentials: they run as the user
+# who sent the batch.
+DROPPED_HEADERS = {"authorization", "content-length", "content-type"}
+# Calls refused outright: the batch itself, and the change feed, whose
+# response never ends.
+UNBATCHABLE_PATHS = {
+    router.prefix: "Batches can't be nested",
+    "/todos/changes": "The change feed can't be batched",
+}
+
+
+class _StreamedBody(Exception):
+    pass
+
+
+async def _dispatch(request: Request, operation: BatchOperation) -> dict:
+    """
+    Runs `operation` through the app as an ASGI request and collects its
+    response. A response that streams its body is cut off and answered
+    with a 422 instead.
+    """
+    path, _, query = operation.path.partition("?")
+    body = b"" if operation.body is None else orjson.dumps(operation.body)
+    headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in operation.headers.items()
+        if name.lower() not in DROPPED_HEADERS
+    ]
+    headers.extend([
+        (b"authorization", request.headers["authorization"].encode()),
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ])
+    scope = {
+        "type": "http",
+        # ASGI 2.4 lets streaming responses skip listening for disconnects.
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": request.scope["http_version"],
+        "scheme": request.scope["scheme"],
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "method": operation.method,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": {},
+    }
+
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    response = {"status": 0, "headers": {}, "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in message.get("headers", [])
+                if name != b"content-length"
+            }
+        elif message["type"] == "http.response.body":
+            # A streamed body may never end, and the batch holds on to its
+            # session and connection until every call has returned.
+            if message.get("more_body", False):
+                raise _StreamedBody
+            response["body"] += message.get("body", b"")
+
+    try:
+        await request.app(scope, receive, send)
+    except _StreamedBody:
+        return {
+            "status": HTTPStatus.UNPROCESSABLE_ENTITY,
+            "headers": {"content-type": "application/json"},
+            "body": {"detail": "Streaming responses can't be batched"},
+        }
+    except Exception:
+        # On an unhandled error the app answers 500 before re-raising for
+        # the server's sake, which here means logging it.
+        logger.exception(
+            "Unhandled error in batched %s %s", operation.method, path
+        )
+
+    content_type = response["headers"].get("content-type", "")
+    if not response["body"]:
+        response["body"] = None
+    elif content_type.startswith("application/json"):
+        response["body"] = orjson.loads(response["body"])
+    else:
+        response["body"] = response["body"].decode()
+
+    return response
+
+
+async def _run(
+    request: Request,
+    requests: list[BatchOperation],
+    session: AsyncSession,
+    atomic: bool,
+    user_id: int,
+) -> list[dict]:
+    responses = []
+    token = batch_session.set(session)
+    try:
+        for operation in requests:
+            responses.append(await _dispatch(request, operation))
+            if responses[-1]["status"] < HTTPStatus.BAD_REQUEST:
+                continue
+            if atomic:
+                break
+
+            if session.in_transaction():
+                # The failed call may have aborted the shared transaction.
+                # Rolling back expires the cached user attached to it.
+                await session.rollback()
+                user_cache.invalidate(user_id)
+    finally:
+        batch_session.reset(token)
+
+    return responses
+
+
+@router.post("", response_model=BatchResult)
+async def run_batch(
+    user: T_CurrentUser,
+    session: T_Session,
+    request: Request,
+    requests: T_BatchRequests,
+    atomic: T_BatchAtomic = False,
+) -> dict:
+    """
+    Runs up to BATCH_MAX_REQUESTS API calls in order, as the caller and in
+    one database session. Atomic batches run in one transaction, stop at
+    the first failure and are only committed if every call succeeded.
+    """
+    for operation in requests:
+        path = operation.path.split("?")[0].rstrip("/")
+        if path in UNBATCHABLE_PATHS:
+            raise HTTPException(
+                status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                detail=UNBATCHABLE_PATHS[path],
+            )
+
+    if not atomic:
+        responses = await _run(request, requests, session, atomic, user.id)
+        return {"responses": responses, "committed": True}
+
+    async with session.bind.connect() as connection:
+        transaction = await connection.begin()
+        # The commits of each call only release a savepoint, the batch
+        # commits or rolls back the transaction around them.
+        async with AsyncSession(
+            connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        ) as atomic_session:
+            responses = await _run(
+                request, requests, atomic_session, atomic, user.id
+            )
+
+        committed = all(
+            response["status"] < HTTPStatus.BAD_REQUEST
+            for response in responses
+        )
+        if committed:
+            await transaction.commit()
+        else:
+            await transaction.rollback()
+
+    # The calls bumped the user's cache generation when they released
+    # their savepoints; bumped again, it covers the outcome of the batch.
+    await todos_cache.invalidate(user.id)
+
+    return {"responses": responses, "committed": committed}
@@ -0,0 +1,21 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, HTTPException
+
+from fast_zero import database
+from fast_zero.schemas import PoolStats
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/pool", response_model=PoolStats)
+def read_pool_stats() -> dict[str, int | float]:
+    stats = database.pool_stats(database.engine)
+
+    if stats is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Pool statistics unavailable",
+        )
+
+    return stats
@@ -1,44 +1,568 @@
+import asyncio
+import codecs
+import csv
+import io
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
 from http import HTTPStatus
 
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import (
+    ColumnElement,
+    Executable,
+    Result,
+    Select,
+    Update,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
 
-from fast_zero.models import Todo
+from fast_zero.changes import ChangeBroker, todo_change
+from fast_zero.conditional import http_date, make_etag, not_modified
+from fast_zero.database import batch_session, is_replica
+from fast_zero.models import TODO_SEARCH_DOCUMENT, Todo, User
+from fast_zero.pagination import next_cursor, paginate
+from fast_zero.response_cache import todos_cache
 from fast_zero.schemas import (
     Message,
+    TodoBulkDeleted,
+    TodoBulkResult,
+    TodoFormat,
+    TodoImportRow,
+    TodoImportSummary,
     TodoList,
     TodoPublic,
     TodoSchema,
+    TodoUpdate,
+)
+from fast_zero.settings import Settings
+from fast_zero.types.types_app import (
+    T_ChangeBroker,
+    T_ReadSession,
+    T_Session,
+    T_TodoBulkCreate,
+    T_TodoBulkIds,
+    T_TodoBulkUpdate,
+    T_TodoExportFilter,
+    T_TodosFilter,
+    T_TodoUpdate,
 )
-from fast_zero.types.types_app import T_Session, T_TodosFilter, T_TodoUpdate
-from fast_zero.types.types_users import T_CurrentUser
+from fast_zero.types.types_users import T_CurrentPrincipal, T_CurrentUser
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
+# Selected in `TodoPublic` field order, so rows serialize to the same JSON.
+TODO_PUBLIC_FIELDS = list(TodoPublic.model_fields)
+TODO_PUBLIC_COLUMNS = [getattr(Todo, field) for field in TODO_PUBLIC_FIELDS]
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+IMPORT_BATCH_SIZE = Settings().TODOS_IMPORT_BATCH_SIZE
+IMPORT_MAX_ERRORS = Settings().TODOS_IMPORT_MAX_ERRORS
+IMPORT_MAX_RECORD_SIZE = Settings().TODOS_IMPORT_MAX_RECORD_SIZE
+CHANGE_FEED_KEEPALIVE_SECONDS = Settings().CHANGE_FEED_KEEPALIVE_SECONDS
+
+
+def _touch_todos(user_id: int) -> Update:
+    """
+    Bumps the version of the user's todo list, which changes its ETag.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        # Keeps `update_at` about the user's own fields.
+        .values(todos_version=User.todos_version + 1, update_at=User.update_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _write_todos(
+    session: AsyncSession,
+    user_id: int,
+    statement: Executable,
+    params: list[dict] | None = None,
+    notification: ColumnElement | None = None,
+) -> Result:
+    """
+    Runs a write to the user's todos and bumps the version of their todo
+    list. On Postgres a single-row write carries the bump as a
+    data-modifying CTE, keeping it to one statement; ORM bulk writes don't
+    support CTEs and bump in a statement of their own. A broker's
+    `notification` is returned along with the written rows.
+    """
+    touch = _touch_todos(user_id)
+    if notification is not None:
+        statement = statement.returning(notification)
+
+    if params is None and session.bind.dialect.name == "postgresql":
+        return await session.execute(
+            statement.add_cte(touch.returning(User.id).cte("touch_todos")),
+            params,
+        )
+
+    result = await session.execute(statement, params)
+    await session.execute(touch)
+    return result
+
+
+async def _commit_todos(
+    session: AsyncSession,
+    user_id: int,
+    broker: ChangeBroker,
+    change: dict,
+    published: bool = False,
+) -> None:
+    """
+    Commits a write to the user's todos, publishing `change` to their
+    change feed with it unless the write carried the broker's
+    notification, then drops their cached lists.
+    """
+    if not published:
+        await broker.publish(session, user_id, change)
+    await session.commit()
+    await todos_cache.invalidate(user_id)
+
 
 @router.post("/", response_model=TodoPublic)
 async def create_todo(
-    user: T_CurrentUser, session: T_Session, todo: TodoSchema
+    user: T_CurrentUser,
+    session: T_Session,
+    broker: T_ChangeBroker,
+    todo: TodoSchema,
 ):
-    db_todo = Todo(
-        title=todo.title,
-        description=todo.description,
-        state=todo.state,
-        user_id=user.id,
+    notification = broker.notification(user.id, "created", Todo.id)
+    created = await _write_todos(
+        session,
+        user.id,
+        insert(Todo)
+        .values(
+            title=todo.title,
+            description=todo.description,
+            state=todo.state,
+            user_id=user.id,
+        )
+        .returning(Todo),
+        notification=notification,
+    )
+    db_todo = created.scalar_one()
+    await _commit_todos(
+        session,
+        user.id,
+        broker,
+        todo_change("created", [db_todo.id]),
+        published=notification is not None,
     )
-
-    session.add(db_todo)
-    await session.commit()
-    await session.refresh(db_todo)
 
     return db_todo
 
 
+@router.post("/bulk", response_model=TodoBulkResult)
+async def create_todos_bulk(
+    user: T_CurrentUser,
+    session: T_Session,
+    broker: T_ChangeBroker,
+    todos: T_TodoBulkCreate,
+):
+    created = await _write_todos(
+        session,
+        user.id,
+        insert(Todo).returning(Todo, sort_by_parameter_order=True),
+        [{**todo.model_dump(), "user_id": user.id} for todo in todos],
+    )
+    db_todos = created.scalars().all()
+    await _commit_todos(
+        session,
+        user.id,
+        broker,
+        todo_change("created", [todo.id for todo in db_todos]),
+    )
+
+    return {"todos": db_todos}
+
+
+@router.patch("/bulk", response_model=TodoBulkResult)
+async def update_todos_bulk(
+    user: T_CurrentUser,
+    session: T_Session,
+    broker: T_ChangeBroker,
+    todos: T_TodoBulkUpdate,
+):
+    changes = [
+        {"id": todo.id, **todo.model_dump(exclude_unset=True)}
+        for todo in todos
+        if todo.model_fields_set - {"id"}
+    ]
+    changed_ids = {change["id"] for change in changes}
+    if changes:
+        # ORM bulk UPDATE by primary key, restricted to the user's todos.
+        # The rows are re-read below, so the identity map isn't synced.
+        await _write_todos(
+            session,
+            user.id,
+            update(Todo)
+            .where(Todo.user_id == user.id)
+            .execution_options(synchronize_session=False),
+            changes,
+        )
+
+    ids = {todo.id for todo in todos}
+    updated = await session.scalars(
+        select(Todo)
+        .where(Todo.user_id == user.id, Todo.id.in_(ids))
+        .order_by(Todo.id)
+        .execution_options(populate_existing=True)
+    )
+    db_todos = updated.all()
+    await _commit_todos(
+        session,
+        user.id,
+        broker,
+        todo_change(
+            "updated",
+            [todo.id for todo in db_todos if todo.id in changed_ids],
+        ),
+    )
+
+    return {
+        "todos": db_todos,
+        "not_found": sorted(ids - {todo.id for todo in db_todos}),
+    }
+
+
+@router.delete("/bulk", response_model=TodoBulkDeleted)
+async def delete_todos_bulk(
+    user: T_CurrentUser,
+    session: T_Session,
+    broker: T_ChangeBroker,
+    ids: T_TodoBulkIds,
+):
+    deleted = await _write_todos(
+        session,
+        user.id,
+        delete(Todo)
+        .where(Todo.user_id == user.id, Todo.id.in_(ids))
+        .returning(Todo.id),
+    )
+    deleted_ids = set(deleted.scalars().all())
+    await _commit_todos(
+        session, user.id, broker, todo_change("deleted", list(deleted_ids))
+    )
+
+    return {
+        "deleted": sorted(deleted_ids),
+        "not_found": sorted(set(ids) - deleted_ids),
+    }
+
+
+def _csv_chunk(rows: list[dict], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=TodoPublic.model_fields)
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+
+    return buffer.getvalue().encode()
+
+
+async def _stream_todos(
+    bind: AsyncEngine | AsyncConnection, query: Select, export_format: str
+) -> AsyncIterator[bytes]:
+    """
+    Streams the rows of `query` through a server-side cursor, one chunk per
+    batch. FastAPI closes the route's session before the body is sent, so
+    the export reads through a session of its own.
+    """
+    async with AsyncSession(bind) as session:
+        result = await session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        if export_format == "csv":
+            yield _csv_chunk([], header=True)
+
+        async for rows in result.partitions():
+            if export_format == "csv":
+                yield _csv_chunk([
+                    {**row._asdict(), "state": row.state.value} for row in rows
+                ])
+            else:
+                yield b"".join(
+                    orjson.dumps(
+                        row._asdict(), option=orjson.OPT_APPEND_NEWLINE
+                    )
+                    for row in rows
+                )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_todos(
+    user: T_CurrentPrincipal,
+    session: T_ReadSession,
+    export_filter: T_TodoExportFilter,
+):
+    query = _filter_todos(
+        select(*TODO_PUBLIC_COLUMNS).where(Todo.user_id == user.id),
+        export_filter,
+    )
+    if export_filter.q:
+        query = _search_todos(
+            query, export_filter.q, session.bind.dialect.name
+        )
+    else:
+        query = query.order_by(Todo.id)
+
+    return StreamingResponse(
+        _stream_todos(session.bind, query, export_filter.format),
+        media_type=EXPORT_MEDIA_TYPES[export_filter.format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="todos.{export_filter.format}"'
+            )
+        },
+    )
+
+
+async def _read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+
+    if pending := pending + decoder.decode(b"", final=True):
+        yield pending.removesuffix("\r")
+
+
+class _NeedMoreInput(Exception):
+    pass
+
+
+class _CsvFeed:
+    """
+    Lines for one `csv.reader` as the upload arrives. When the reader runs
+    out of lines inside a quoted field, the lines of the unfinished record
+    are kept and parsed again once a line that may close it arrives.
+    """
+
+    def __init__(self, max_record_size: int):
+        self.reader = csv.reader(self)
+        self.max_record_size = max_record_size
+        self.lines: deque[str] = deque()
+        self.size = 0
+        self.taken: list[str] = []
+        self.waiting = False
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            if self.closed:
+                raise StopIteration
+            raise _NeedMoreInput
+        self.taken.append(self.lines.popleft())
+        return self.taken[-1]
+
+    def parse(self, line: str | None) -> Iterator[list[str] | csv.Error]:
+        """
+        Records completed by `line`, or by the end of the upload when it's
+        None. A record that can't be parsed comes out as its error.
+        """
+        if line is None:
+            self.closed = True
+        else:
+            self.lines.append(f"{line}\n")
+            self.size += len(line) + 1
+            # Only a line with a quote can close an unfinished record.
+            if (
+                self.waiting
+                and '"' not in line
+                and self.size <= self.max_record_size
+            ):
+                return
+
+        self.waiting = False
+        while self.lines:
+            self.taken = []
+            try:
+                values = next(self.reader)
+            except _NeedMoreInput:
+                if self.size > self.max_record_size:
+                    self.lines.clear()
+                    self.size = 0
+                    yield csv.Error(
+                        f"record longer than {self.max_record_size} characters"
+                    )
+                    return
+                self.lines.extendleft(reversed(self.taken))
+                self.waiting = True
+                return
+            except csv.Error as error:
+                values = error
+
+            self.size -= sum(map(len, self.taken))
+            yield values
+
+
+async def _read_csv(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[list[str] | csv.Error]:
+    feed = _CsvFeed(IMPORT_MAX_RECORD_SIZE)
+    async for line in lines:
+        for values in feed.parse(line):
+            yield values
+
+    for values in feed.parse(None):
+        yield values
+
+
+async def _read_records(
+    chunks: AsyncIterator[bytes], import_format: TodoFormat
+) -> AsyncIterator[tuple[int, str | dict | csv.Error]]:
+    """
+    Numbered records of an upload as it arrives: raw JSON lines for NDJSON,
+    dicts keyed by the header for CSV, or the error of a CSV record that
+    couldn't be parsed.
+    """
+    row = 0
+    lines = _read_lines(chunks)
+    if import_format == "ndjson":
+        async for line in lines:
+            if line.strip():
+                row += 1
+                yield row, line
+        return
+
+    header = None
+    async for values in _read_csv(lines):
+        if isinstance(values, csv.Error):
+            row += 1
+            yield row, values
+        elif not values or (len(values) == 1 and not values[0].strip()):
+            # Blank lines.
+            continue
+        elif header is None:
+            header = values
+        else:
+            row += 1
+            yield row, dict(zip(header, values))
+
+
+def _describe(error: ValidationError | csv.Error) -> str:
+    if isinstance(error, csv.Error):
+        return f"row: {error}"
+    return "; ".join(
+        f"{'.'.join(map(str, detail['loc'])) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+@router.post("/import", response_model=TodoImportSummary)
+async def import_todos(
+    user: T_CurrentUser,
+    session: T_Session,
+    broker: T_ChangeBroker,
+    request: Request,
+    format: TodoFormat = "ndjson",
+):
+    imported = failed = 0
+    errors = []
+    batch = []
+
+    async for row, record in _read_records(request.stream(), format):
+        try:
+            if isinstance(record, csv.Error):
+                raise record
+            todo = (
+                TodoImportRow.model_validate_json(record)
+                if isinstance(record, str)
+                else TodoImportRow.model_validate(record)
+            )
+        except (ValidationError, csv.Error) as error:
+            failed += 1
+            if len(errors) < IMPORT_MAX_ERRORS:
+                errors.append({"row": row, "detail": _describe(error)})
+            continue
+
+        batch.append({**todo.model_dump(), "user_id": user.id})
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await session.execute(insert(Todo), batch)
+            imported += len(batch)
+            batch.clear()
+
+    if batch:
+        await session.execute(insert(Todo), batch)
+        imported += len(batch)
+    # Bumped once, at the end, so the user's row is only locked from here
+    # to the commit rather than for the whole upload.
+    await session.execute(_touch_todos(user.id))
+    # The inserts don't return ids, subscribers refetch instead.
+    await _commit_todos(session, user.id, broker, todo_change("created", None))
+
+    return {"imported": imported, "failed": failed, "errors": errors}
+
+
+async def _change_events(
+    broker: ChangeBroker, user_id: int
+) -> AsyncIterator[bytes]:
+    async with broker.subscribe(user_id) as subscription:
+        # Sent right away, so clients and proxies see the stream open.
+        yield b": connected\n\n"
+        while True:
+            try:
+                change = await asyncio.wait_for(
+                    subscription.get(), CHANGE_FEED_KEEPALIVE_SECONDS
+                )
+            except TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+
+            yield (
+                f"event: {change['event']}\n".encode()
+                + b"data: "
+                + orjson.dumps(change)
+                + b"\n\n"
+            )
+
+
+@router.get("/changes", response_class=StreamingResponse)
+async def stream_todo_changes(
+    user: T_CurrentPrincipal, broker: T_ChangeBroker
+):
+    """
+    Server-sent events for every write to the user's todos, in place of
+    polling the list. A `resync` event means changes may have been missed
+    and the list should be fetched again.
+    """
+    # Checked before the stream starts, while a 503 can still be sent.
+    await broker.connect()
+
+    return StreamingResponse(
+        _change_events(broker, user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{todo_id}", response_model=TodoPublic)
 async def get_todo_by_id(
     todo_id: int,
-    user: T_CurrentUser,
-    session: T_Session,
+    user: T_CurrentPrincipal,
+    session: T_ReadSession,
+    request: Request,
+    response: Response,
 ):
     todo = await session.scalar(
         select(Todo).where(Todo.user_id == user.id, Todo.id == todo_id)
@@ -50,22 +574,19 @@ async def get_todo_by_id(
             detail="Todo not found",
         )
 
+    headers = {
+        "ETag": make_etag(todo.id, todo.version),
+        "Last-Modified": http_date(todo.updated_at),
+        "Cache-Control": "private, no-cache",
+    }
+    if not_modified(request.headers, headers["ETag"], todo.updated_at):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
     return todo
 
 
-@router.get("/", response_model=TodoList)
-async def get_user_todos(
-    user: T_CurrentUser,
-    session: T_Session,
-    todos_filter: T_TodosFilter,
-):
-    query = (
-        select(Todo)
-        .where(Todo.user_id == user.id)
-        .offset(todos_filter.offset)
-        .limit(todos_filter.limit)
-    )
-
+def _filter_todos(query: Select, todos_filter: TodoUpdate) -> Select:
     if todos_filter.title:
         query = query.filter(Todo.title.contains(todos_filter.title))
 
@@ -77,29 +598,163 @@ async def get_user_todos(
     if todos_filter.state:
         query = query.filter(Todo.state == todos_filter.state)
 
-    all_todos = await session.scalars(query)
+    return query
+
+
+def _search_todos(query: Select, q: str, dialect: str) -> Select:
+    """
+    Filters by the `q` search terms, best matches first. Postgres uses the
+    full-text GIN index; other databases fall back to a substring match.
+    """
+    if dialect != "postgresql":
+        return query.filter(
+            or_(
+                Todo.title.contains(q, autoescape=True),
+                Todo.description.contains(q, autoescape=True),
+            )
+        ).order_by(Todo.id)
 
-    return {"todos": all_todos.all()}
+    document = literal_column(TODO_SEARCH_DOCUMENT)
+    ts_query = func.websearch_to_tsquery(
+        literal_column("'simple'::regconfig"), q
+    )
+
+    return query.filter(document.bool_op("@@")(ts_query)).order_by(
+        func.ts_rank(document, ts_query).desc(), Todo.id
+    )
+
+
+def _list_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+@router.get("/", response_model=TodoList)
+async def get_user_todos(
+    user: T_CurrentPrincipal,
+    session: T_ReadSession,
+    todos_filter: T_TodosFilter,
+    request: Request,
+):
+    params = todos_filter.model_dump_json()
+    cache_key = await todos_cache.key(user.id, params)
+    if (cached := await todos_cache.get(cache_key)) is not None:
+        etag, body = cached
+        if not_modified(request.headers, etag):
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED,
+                headers=_list_headers(etag),
+            )
+        return Response(
+            body, media_type="application/json", headers=_list_headers(etag)
+        )
+
+    version_query = select(User.todos_version).where(User.id == user.id)
+
+    # A revalidation only needs the list version, not the page itself.
+    if "if-none-match" in request.headers:
+        headers = _list_headers(
+            make_etag(user.id, await session.scalar(version_query), params)
+        )
+        if not_modified(request.headers, headers["ETag"]):
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED, headers=headers
+            )
+
+    # Otherwise the version is read along with the page, in one statement.
+    query = _filter_todos(
+        select(
+            version_query.scalar_subquery().label("todos_version"),
+            *TODO_PUBLIC_COLUMNS,
+        ).where(Todo.user_id == user.id),
+        todos_filter,
+    )
+
+    if todos_filter.q:
+        if todos_filter.cursor is not None:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail="Search results can't be paginated with a cursor",
+            )
+
+        query = (
+            _search_todos(query, todos_filter.q, session.bind.dialect.name)
+            .offset(todos_filter.offset)
+            .limit(todos_filter.limit)
+        )
+    else:
+        query = paginate(query, Todo.id, todos_filter)
+
+    all_todos = await session.execute(query)
+    todos = all_todos.all()
+    cursor = None if todos_filter.q else next_cursor(todos, todos_filter)
+    todos_version = (
+        todos[0].todos_version
+        if todos
+        else await session.scalar(version_query)
+    )
+
+    # Plain rows straight to orjson, skipping `TodoList` validation.
+    etag = make_etag(user.id, todos_version, params)
+    response = ORJSONResponse(
+        {
+            "todos": [
+                dict(zip(TODO_PUBLIC_FIELDS, todo[1:])) for todo in todos
+            ],
+            "next_cursor": cursor,
+        },
+        headers=_list_headers(etag),
+    )
+    # Not when a batch may still roll back the writes this list shows,
+    # nor when a lagging replica may be missing the write that moved the
+    # user to the generation the page would be stored under.
+    if batch_session.get() is None and not is_replica(session):
+        await todos_cache.set(cache_key, etag, response.body)
+
+    return response
 
 
 @router.patch("/{todo_id}", response_model=TodoPublic)
 async def update_todo(
-    todo_id: int, todo: T_TodoUpdate, user: T_CurrentUser, session: T_Session
+    todo_id: int,
+    todo: T_TodoUpdate,
+    user: T_CurrentUser,
+    session: T_Session,
+    broker: T_ChangeBroker,
 ):
-    todo_to_update = await session.scalar(
-        select(Todo).where(Todo.user_id == user.id, Todo.id == todo_id)
+    changes = todo.model_dump(exclude_unset=True)
+    query = (
+        update(Todo).values(**changes).returning(Todo)
+        if changes
+        else select(Todo)
     )
+
+    query = query.where(
+        Todo.user_id == user.id, Todo.id == todo_id
+    ).execution_options(populate_existing=True)
+
+    notification = broker.notification(user.id, "updated", Todo.id)
+    if not changes:
+        todo_to_update = await session.scalar(query)
+    else:
+        updated = await _write_todos(
+            session, user.id, query, notification=notification
+        )
+        todo_to_update = updated.scalar()
+
     if todo_to_update is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Todo not found",
         )
 
-    for key, value in todo.model_dump(exclude_unset=True).items():
-        setattr(todo_to_update, key, value)
-
-    await session.commit()
-    await session.refresh(todo_to_update)
+    if changes:
+        await _commit_todos(
+            session,
+            user.id,
+            broker,
+            todo_change("updated", [todo_id]),
+            published=notification is not None,
+        )
 
     return todo_to_update
 
@@ -109,17 +764,29 @@ async def delete_todo(
     todo_id: int,
     session: T_Session,
     current_user: T_CurrentUser,
+    broker: T_ChangeBroker,
 ) -> HTTPException | dict[str, str]:
-    todo_to_delete = await session.scalar(
-        select(Todo).where(Todo.user_id == current_user.id, Todo.id == todo_id)
+    notification = broker.notification(current_user.id, "deleted", Todo.id)
+    deleted = await _write_todos(
+        session,
+        current_user.id,
+        delete(Todo)
+        .where(Todo.user_id == current_user.id, Todo.id == todo_id)
+        .returning(Todo.id),
+        notification=notification,
     )
-    if todo_to_delete is None:
+    if deleted.scalar() is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Todo not found",
         )
 
-    await session.delete(todo_to_delete)
-    await session.commit()
+    await _commit_todos(
+        session,
+        current_user.id,
+        broker,
+        todo_change("deleted", [todo_id]),
+        published=notification is not None,
+    )
 
     return {"message": "Todo deleted successfully"}
@@ -1,30 +1,42 @@
 from http import HTTPStatus
-from typing import Sequence
 
 from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert, select, update
 from sqlalchemy.exc import IntegrityError
 
+from fast_zero.hashing import password_hasher
 from fast_zero.models import User
+from fast_zero.pagination import next_cursor, paginate
 from fast_zero.schemas import Message, UserList, UserPublic, UserSchema
-from fast_zero.security import get_password_hash
-from fast_zero.types.types_app import T_PaginationFilter, T_Session
+from fast_zero.security import user_cache
+from fast_zero.types.types_app import (
+    T_PaginationFilter,
+    T_ReadSession,
+    T_Session,
+)
 from fast_zero.types.types_users import T_CurrentUser
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+USER_PUBLIC_COLUMNS = [
+    getattr(User, field) for field in UserPublic.model_fields
+]
+
 
 @router.get("/", response_model=UserList)
 async def read_users(
-    session: T_Session, pagination_filter: T_PaginationFilter
-) -> dict[str, Sequence[User]]:
-    query = await session.scalars(
-        select(User)
-        .offset(pagination_filter.offset)
-        .limit(pagination_filter.limit)
+    session: T_ReadSession, pagination_filter: T_PaginationFilter
+) -> ORJSONResponse:
+    query = await session.execute(
+        paginate(select(*USER_PUBLIC_COLUMNS), User.id, pagination_filter)
     )
+    users = query.all()
 
-    return {"users": query.all()}
+    return ORJSONResponse({
+        "users": [user._asdict() for user in users],
+        "next_cursor": next_cursor(users, pagination_filter),
+    })
 
 
 @router.post("/", status_code=HTTPStatus.CREATED, response_model=UserPublic)
@@ -44,14 +56,16 @@ async def create_user(user: UserSchema, session: T_Session) -> User:
                 status_code=HTTPStatus.CONFLICT, detail="Email already exists"
             )
 
-    db_user = User(
-        username=user.username,
-        password=get_password_hash(user.password),
-        email=user.email,
+    db_user = await session.scalar(
+        insert(User)
+        .values(
+            username=user.username,
+            password=await password_hasher.hash(user.password),
+            email=user.email,
+        )
+        .returning(User)
     )
-    session.add(db_user)
     await session.commit()
-    await session.refresh(db_user)
 
     return db_user
 
@@ -69,15 +83,27 @@ async def update_users(
             detail="Not enough permission",
         )
 
-    try:
-        current_user.username = user.username
-        current_user.email = user.email
-        current_user.password = get_password_hash(user.password)
+    user_cache.invalidate(current_user.id)
+
+    values = {"username": user.username, "email": user.email}
+    if not await password_hasher.verify(user.password, current_user.password):
+        # A new password logs out every existing token.
+        values.update(
+            password=await password_hasher.hash(user.password),
+            token_version=User.token_version + 1,
+        )
 
+    try:
+        updated_user = await session.scalar(
+            update(User)
+            .where(User.id == current_user.id)
+            .values(**values)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
         await session.commit()
-        await session.refresh(current_user)
 
-        return current_user
+        return updated_user
 
     except IntegrityError:
         raise HTTPException(
@@ -98,6 +124,8 @@ async def delete_users(
             detail="Not enough permission",
         )
 
+    user_cache.invalidate(current_user.id)
+
     await session.delete(current_user)
     await session.commit()
 
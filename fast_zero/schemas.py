@@ -1,3 +1,5 @@
+from typing import Any, Literal
+
 from pydantic import BaseModel, ConfigDict, EmailStr
 
 from fast_zero.models import TodoState
@@ -7,6 +9,16 @@ class Message(BaseModel):
     message: str
 
 
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    wait_seconds: float
+    max_wait_seconds: float
+
+
 class UserSchema(BaseModel):
     username: str
     email: EmailStr
@@ -22,6 +34,7 @@ class UserPublic(BaseModel):
 
 class UserList(BaseModel):
     users: list[UserPublic]
+    next_cursor: str | None = None
 
 
 class Token(BaseModel):
@@ -32,6 +45,7 @@ class Token(BaseModel):
 class PaginationFilter(BaseModel):
     offset: int = 0
     limit: int = 100
+    cursor: str | None = None
 
 
 class TodoSchema(BaseModel):
@@ -47,6 +61,7 @@ class TodoPublic(TodoSchema):
 
 class TodoList(BaseModel):
     todos: list[TodoPublic]
+    next_cursor: str | None = None
 
 
 class TodoUpdate(BaseModel):
@@ -55,4 +70,60 @@ class TodoUpdate(BaseModel):
     state: TodoState | None = None
 
 
-class TodosFilter(TodoUpdate, PaginationFilter): ...
+class TodoBulkUpdate(TodoUpdate):
+    id: int
+
+
+class TodoBulkResult(BaseModel):
+    todos: list[TodoPublic]
+    not_found: list[int] = []
+
+
+class TodoBulkDeleted(BaseModel):
+    deleted: list[int]
+    not_found: list[int]
+
+
+class TodosFilter(TodoUpdate, PaginationFilter):
+    q: str | None = None
+
+
+TodoFormat = Literal["ndjson", "csv"]
+
+
+class TodoExportFilter(TodoUpdate):
+    q: str | None = None
+    format: TodoFormat = "ndjson"
+
+
+class TodoImportRow(TodoSchema):
+    description: str
+
+
+class TodoImportError(BaseModel):
+    row: int
+    detail: str
+
+
+class TodoImportSummary(BaseModel):
+    imported: int
+    failed: int
+    errors: list[TodoImportError]
+
+
+class BatchOperation(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str
+    headers: dict[str, str] = {}
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    status: int
+    headers: dict[str, str]
+    body: Any
+
+
+class BatchResult(BaseModel):
+    responses: list[BatchResponse]
+    committed: bool
@@ -1,4 +1,6 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from hashlib import sha256
 from http import HTTPStatus
 from zoneinfo import ZoneInfo
 
@@ -7,21 +9,84 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt import decode, encode
 from jwt.exceptions import DecodeError, ExpiredSignatureError
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 from sqlalchemy import select
 
+from fast_zero.cache import TTLCache
+from fast_zero.database import batch_session
 from fast_zero.models import User
 from fast_zero.settings import Settings
 from fast_zero.types.types_app import T_OAuthPassBearer, T_Session
 
-pwd_context = PasswordHash.recommended()
+pwd_context = PasswordHash((
+    Argon2Hasher(
+        time_cost=Settings().ARGON2_TIME_COST,
+        memory_cost=Settings().ARGON2_MEMORY_COST,
+        parallelism=Settings().ARGON2_PARALLELISM,
+    ),
+))
+# Verified in place of a real hash when the user doesn't exist, so an
+# unknown email takes as long to reject as a wrong password.
+DUMMY_PASSWORD_HASH = pwd_context.hash("dummy-password")
 oauth2_schema = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 ACCESS_TOKEN_EXPIRE_MINUTES = Settings().ACCESS_TOKEN_EXPIRE_MINUTES
 ALGORITHM = Settings().ALGORITHM
 SECRET_KEY = Settings().SECRET_KEY
+STATELESS_AUTH = Settings().STATELESS_AUTH
 
 
-async def get_current_user(session: T_Session, token: T_OAuthPassBearer):
+def make_user_cache(settings: Settings) -> TTLCache[int, User]:
+    """
+    The cache of resolved users, which only stores them when the app runs
+    in a single worker. The other workers couldn't invalidate a worker's
+    copy, so a user deleted or changed through them would keep
+    authenticating there, as they were, until the entry expired.
+    """
+    single_worker = settings.SERVER_WORKERS in {None, 1}
+    return TTLCache(
+        max_size=settings.USER_CACHE_MAX_SIZE if single_worker else 0,
+        ttl=settings.USER_CACHE_TTL_SECONDS,
+    )
+
+
+user_cache = make_user_cache(Settings())
+token_cache: TTLCache[bytes, dict] = TTLCache(
+    max_size=Settings().TOKEN_CACHE_MAX_SIZE
+)
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Decodes and verifies a JWT. The claims of verified tokens are kept
+    until the token's `exp`, so a token reused across requests only has
+    its signature checked once.
+    """
+    digest = sha256(token.encode()).digest()
+
+    if (claims := token_cache.get(digest)) is not None:
+        if claims["exp"] > datetime.now(tz=ZoneInfo("UTC")).timestamp():
+            return claims
+        token_cache.invalidate(digest)
+
+    claims = decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if "exp" in claims:
+        token_cache.set(digest, claims)
+
+    return claims
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as far as the access token tells.
+    """
+
+    id: int
+    token_version: int
+
+
+def _token_principal(token: str) -> Principal:
     credentials_exception = HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail="Could not validate credentials.",
@@ -29,29 +94,59 @@ async def get_current_user(session: T_Session, token: T_OAuthPassBearer):
     )
 
     try:
-        payload = decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        subject_email: str = payload.get("sub")
-        if subject_email is None:
-            raise credentials_exception
+        payload = decode_access_token(token)
+        return Principal(id=int(payload["sub"]), token_version=payload["ver"])
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail="Token expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except DecodeError:
+    except (DecodeError, KeyError, TypeError, ValueError):
         raise credentials_exception
 
-    user = await session.scalar(
-        select(User).where(User.email == subject_email)
-    )
 
-    if user is None:
-        raise credentials_exception
+async def get_current_user(session: T_Session, token: T_OAuthPassBearer):
+    principal = _token_principal(token)
+
+    if (user := user_cache.get(principal.id)) is not None:
+        user = await session.merge(user, load=False)
+    else:
+        user = await session.scalar(
+            select(User).where(User.id == principal.id)
+        )
+        # Only stored on a miss: refreshing the entry on every hit would
+        # keep it from ever expiring, and with it writes made by other
+        # workers from ever being seen. Nor from within a batch, whose
+        # session may hold writes its transaction later rolls back.
+        if user is not None and batch_session.get() is None:
+            user_cache.set(principal.id, user)
+
+    if user is None or user.token_version != principal.token_version:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail="Could not validate credentials.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return user
 
 
+async def get_current_principal(
+    session: T_Session, token: T_OAuthPassBearer
+) -> Principal:
+    """
+    For routes that only need the user's id. With STATELESS_AUTH the
+    verified claims are trusted as they are, which skips the users table
+    but leaves revoked tokens usable until they expire.
+    """
+    if STATELESS_AUTH:
+        return _token_principal(token)
+
+    user = await get_current_user(session, token)
+    return Principal(id=user.id, token_version=user.token_version)
+
+
 def get_password_hash(password: str) -> str:
     """
     Hashes a password using the recommended hashing algorithm.
@@ -66,6 +161,24 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verifies a plain password, also returning a new hash when the stored
+    one was made with other Argon2 parameters than the configured ones.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def token_payload(user: User) -> dict:
+    """
+    Claims identifying `user`: the immutable primary key and the token
+    version, which `/auth/revoke` bumps to invalidate issued tokens.
+    """
+    return {"sub": str(user.id), "ver": user.token_version}
+
+
 def create_acess_token(data_payload: dict):
     to_encode = data_payload.copy()
     to_encode.update({
@@ -0,0 +1,52 @@
+"""
+Production server entry point:
+
+    python -m fast_zero.serve
+
+Runs the app under uvicorn with the SERVER_* settings, one worker per
+available CPU unless SERVER_WORKERS says otherwise.
+"""
+
+import os
+from importlib.util import find_spec
+
+import uvicorn
+
+from fast_zero.settings import Settings
+
+
+def default_workers() -> int:
+    """
+    CPUs this process may run on, which honours container CPU sets.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover
+        return os.cpu_count() or 1
+
+
+def server_options(settings: Settings) -> dict:
+    return {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "workers": settings.SERVER_WORKERS or default_workers(),
+        "loop": "uvloop" if find_spec("uvloop") else "asyncio",
+        "http": "httptools" if find_spec("httptools") else "h11",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "access_log": settings.SERVER_ACCESS_LOG,
+        "proxy_headers": True,
+    }
+
+
+def main() -> None:
+    options = server_options(Settings())
+    # Lets each worker know how many there are, which turns their
+    # in-process caches off when there are several.
+    os.environ["SERVER_WORKERS"] = str(options["workers"])
+    uvicorn.run("fast_zero.app:app", **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,3 +12,71 @@ class Settings(BaseSettings):
     ALGORITHM: str
     DATABASE_URL: str
     SECRET_KEY: str
+
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8000
+    # Defaults to one worker per CPU this process may run on. Unset outside
+    # `fast_zero.serve`, which exports the count it resolved to its workers.
+    SERVER_WORKERS: int | None = None
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_ACCESS_LOG: bool = False
+
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_STATEMENT_TIMEOUT_MS: int | None = None
+    DATABASE_PREPARE_THRESHOLD: int | None = 5
+
+    REPLICA_DATABASE_URLS: list[str] = []
+    REPLICA_RETRY_SECONDS: float = 30.0
+
+    # Argon2 cost; pick values with `python -m fast_zero.calibrate`. Hashes
+    # made with other values are upgraded on the user's next login.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65_536
+    ARGON2_PARALLELISM: int = 4
+
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Off with several workers, see `fast_zero.security.make_user_cache`.
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 30.0
+
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+    # Trust verified token claims on id-only routes instead of loading the
+    # user, at the cost of revocation only applying once tokens expire.
+    STATELESS_AUTH: bool = False
+
+    LOGIN_USERNAME_RATE_PER_MINUTE: float = 10.0
+    LOGIN_USERNAME_BURST: int = 5
+    LOGIN_IP_RATE_PER_MINUTE: float = 60.0
+    LOGIN_IP_BURST: int = 20
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 10_000
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS: int = 8
+
+    # The in-process list cache is off with several workers, see
+    # `fast_zero.response_cache.make_backend`.
+    TODOS_CACHE_MAX_SIZE: int = 1024
+    TODOS_CACHE_TTL_SECONDS: float = 60.0
+
+    TODOS_BULK_MAX_SIZE: int = 1000
+    BATCH_MAX_REQUESTS: int = 50
+    TODOS_IMPORT_BATCH_SIZE: int = 1000
+    TODOS_IMPORT_MAX_ERRORS: int = 100
+    # Characters a CSV record may span, quoted line breaks included.
+    TODOS_IMPORT_MAX_RECORD_SIZE: int = 65_536
+
+    CHANGE_FEED_QUEUE_SIZE: int = 100
+    CHANGE_FEED_MAX_IDS: int = 100
+    CHANGE_FEED_KEEPALIVE_SECONDS: float = 15.0
+    CHANGE_FEED_RETRY_SECONDS: float = 1.0
+    CHANGE_FEED_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+    SQL_PROFILING: bool = False
+    SQL_PROFILING_REPEAT_THRESHOLD: int = 3
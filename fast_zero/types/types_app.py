@@ -1,18 +1,51 @@
 from typing import Annotated
 
-from fastapi import Depends, Query
+from fastapi import Body, Depends, Query
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from fast_zero.database import get_session
-from fast_zero.schemas import PaginationFilter, TodosFilter, TodoUpdate
+from fast_zero.changes import ChangeBroker, get_change_broker
+from fast_zero.database import use_read_session, use_session
+from fast_zero.schemas import (
+    BatchOperation,
+    PaginationFilter,
+    TodoBulkUpdate,
+    TodoExportFilter,
+    TodoSchema,
+    TodosFilter,
+    TodoUpdate,
+)
+from fast_zero.settings import Settings
+
+TODOS_BULK_MAX_SIZE = Settings().TODOS_BULK_MAX_SIZE
+BATCH_MAX_REQUESTS = Settings().BATCH_MAX_REQUESTS
 
 T_PaginationFilter = Annotated[PaginationFilter, Query()]
 T_TodosFilter = Annotated[TodosFilter, Query()]
 T_TodoUpdate = Annotated[TodoUpdate, Query()]
+T_TodoExportFilter = Annotated[TodoExportFilter, Query()]
+
+T_TodoBulkCreate = Annotated[
+    list[TodoSchema], Body(min_length=1, max_length=TODOS_BULK_MAX_SIZE)
+]
+T_TodoBulkUpdate = Annotated[
+    list[TodoBulkUpdate], Body(min_length=1, max_length=TODOS_BULK_MAX_SIZE)
+]
+T_TodoBulkIds = Annotated[
+    list[int],
+    Body(embed=True, min_length=1, max_length=TODOS_BULK_MAX_SIZE),
+]
+
+T_BatchRequests = Annotated[
+    list[BatchOperation],
+    Body(embed=True, min_length=1, max_length=BATCH_MAX_REQUESTS),
+]
+T_BatchAtomic = Annotated[bool, Body(embed=True)]
 
 T_OAuthForm = Annotated[OAuth2PasswordRequestForm, Depends()]
 T_OAuthPassBearer = Annotated[
     OAuth2PasswordBearer(tokenUrl="auth/token"), Depends()
 ]
-T_Session = Annotated[AsyncSession, Depends(get_session)]
+T_Session = Annotated[AsyncSession, Depends(use_session)]
+T_ReadSession = Annotated[AsyncSession, Depends(use_read_session)]
+T_ChangeBroker = Annotated[ChangeBroker, Depends(get_change_broker)]
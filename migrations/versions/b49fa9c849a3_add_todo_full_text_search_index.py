@@ -0,0 +1,40 @@
+"""add todo full text search index
+
+Revision ID: b49fa9c849a3
+Revises: ee23dcf8f438
+Create Date: 2026-10-18 20:55:22.081717
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b49fa9c849a3'
+down_revision: Union[str, None] = 'ee23dcf8f438'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_todos_search',
+            'todos',
+            [sa.text("to_tsvector('simple'::regconfig, (title || ' ') || description)")],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_todos_search', table_name='todos', postgresql_concurrently=True)
@@ -1,5 +1,6 @@
 from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
 from testcontainers.postgres import PostgresContainer
 
 import pytest
@@ -10,8 +11,12 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 from fast_zero.app import app
-from fast_zero.database import get_session
+from fast_zero.database import get_read_session, get_session
 from fast_zero.models import table_registry
+from fast_zero.profiling import QueryProfile
+from fast_zero.rate_limit import login_limiter
+from fast_zero.response_cache import todos_cache
+from fast_zero.security import token_cache, user_cache
 from fast_zero.settings import Settings
 from tests.factories import TodoFactory, UserFactory
 
@@ -21,8 +26,14 @@ def client(session):
     def get_session_override():
         return session
 
+    token_cache.clear()
+    user_cache.clear()
+    todos_cache.backend.clear()
+    login_limiter.backend.clear()
+
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_read_session] = get_session_override
         yield client
 
     app.dependency_overrides.clear()
@@ -31,7 +42,12 @@ def client(session):
 @pytest.fixture(scope="session")
 def engine():
     with PostgresContainer("postgres:16", driver="psycopg") as postgres:
-        yield create_async_engine(postgres.get_connection_url())
+        # Every test recreates the tables (and the todostate enum), which
+        # invalidates plans psycopg would otherwise prepare across tests.
+        yield create_async_engine(
+            postgres.get_connection_url(),
+            connect_args={"prepare_threshold": None},
+        )
 
 
 @pytest_asyncio.fixture
@@ -97,6 +113,60 @@ def mock_db_time():
     return _mock_db_time
 
 
+@contextmanager
+def _record_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+    yield statements
+
+    event.remove(
+        engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+
+@pytest.fixture
+def count_queries(session):
+    return partial(_record_queries, session.bind)
+
+
+@pytest.fixture
+def query_budget(session):
+    """
+    Fails the test when the block issues more statements than allowed:
+
+        with query_budget(2):
+            client.get("/todos/1", headers=headers)
+    """
+
+    @contextmanager
+    def budget(max_queries):
+        with _record_queries(session.bind) as statements:
+            yield statements
+
+        if len(statements) > max_queries:
+            repeated = QueryProfile(
+                [(statement, 0.0) for statement in statements]
+            ).repeated(threshold=2)
+            pytest.fail(
+                f"{len(statements)} queries over a budget of {max_queries}"
+                + "".join(f"\n  {statement}" for statement in statements)
+                + "".join(
+                    f"\nrepeated {times}x: {statement}"
+                    for statement, times in repeated.items()
+                ),
+                pytrace=False,
+            )
+
+    return budget
+
+
 @pytest_asyncio.fixture
 async def todo(client, token):
     todo_factory = TodoFactory()
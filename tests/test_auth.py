@@ -1,6 +1,16 @@
 from http import HTTPStatus
 
+import pytest
 from freezegun import freeze_time
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from fast_zero.hashing import password_hasher
+from fast_zero.rate_limit import login_limiter
+from fast_zero.security import (
+    DUMMY_PASSWORD_HASH,
+    pwd_context,
+    verify_password,
+)
 
 route = "/auth"
 
@@ -82,3 +92,92 @@ def test_token_expired_dont_refresh(client, user):
         )
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_revoke_tokens(client, user, token):
+    response = client.post(
+        f"{route}/revoke", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"message": "Tokens revoked"}
+
+    response = client.post(
+        f"{route}/refresh_token",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    response = client.post(
+        f"{route}/token",
+        data={"username": user.email, "password": user.clean_password},
+    )
+    response = client.post(
+        f"{route}/refresh_token",
+        headers={
+            "Authorization": f"Bearer {response.json()['access_token']}"
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_login_rate_limited_before_hashing(client, user, monkeypatch):
+    calls = []
+
+    async def verify_and_update(plain_password, hashed_password):
+        calls.append(hashed_password)
+        return False, None
+
+    monkeypatch.setattr(password_hasher, "verify_and_update", verify_and_update)
+
+    for _ in range(login_limiter.username_limit.burst):
+        response = client.post(
+            f"{route}/token", data={"username": user.email, "password": "x"}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    response = client.post(
+        f"{route}/token", data={"username": user.email, "password": "x"}
+    )
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+    assert len(calls) == login_limiter.username_limit.burst
+
+
+def test_login_unknown_user_verifies_a_dummy_hash(client, monkeypatch):
+    calls = []
+
+    async def verify_and_update(plain_password, hashed_password):
+        calls.append(hashed_password)
+        return True, None
+
+    monkeypatch.setattr(password_hasher, "verify_and_update", verify_and_update)
+
+    response = client.post(
+        f"{route}/token",
+        data={"username": "nobody@test.com", "password": "secret"},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert calls == [DUMMY_PASSWORD_HASH]
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password(client, session, user):
+    outdated_hash = Argon2Hasher(time_cost=1, memory_cost=8_192).hash(
+        user.clean_password
+    )
+    user.password = outdated_hash
+    await session.commit()
+
+    response = client.post(
+        f"{route}/token",
+        data={"username": user.email, "password": user.clean_password},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    await session.refresh(user)
+    assert user.password != outdated_hash
+    assert verify_password(user.clean_password, user.password)
+    assert not pwd_context.current_hasher.check_needs_rehash(user.password)
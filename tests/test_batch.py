@@ -0,0 +1,252 @@
+import logging
+from http import HTTPStatus
+
+from fast_zero.app import app
+from fast_zero.database import get_read_session
+from fast_zero.types.types_app import BATCH_MAX_REQUESTS
+
+route = "/batch"
+
+
+def create(title):
+    return {
+        "method": "POST",
+        "path": "/todos/",
+        "body": {"title": title, "description": "batch", "state": "todo"},
+    }
+
+
+def test_batch_runs_requests_in_order(client, token):
+    response = client.post(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "requests": [
+                create("first"),
+                {"method": "GET", "path": "/todos/1"},
+                {"method": "GET", "path": "/todos/99"},
+                {"method": "GET", "path": "/todos/?title=first"},
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    result = response.json()
+    assert result["committed"] is True
+    assert [item["status"] for item in result["responses"]] == [
+        HTTPStatus.OK,
+        HTTPStatus.OK,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.OK,
+    ]
+    assert result["responses"][1]["body"]["title"] == "first"
+    assert "etag" in result["responses"][1]["headers"]
+    assert result["responses"][2]["body"] == {"detail": "Todo not found"}
+    assert [
+        todo["title"] for todo in result["responses"][3]["body"]["todos"]
+    ] == ["first"]
+
+
+def test_batch_authenticates_once(client, todo, token, count_queries):
+    with count_queries() as queries:
+        response = client.post(
+            route,
+            headers={"Authorization": f"Bearer {token}"},
+            json={
+                "requests": [
+                    {"method": "GET", "path": f"/todos/{todo['id']}"}
+                ]
+                * 5
+            },
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len([query for query in queries if "FROM users" in query]) <= 1
+
+
+def test_atomic_batch_commits(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        route,
+        headers=headers,
+        json={"requests": [create("one"), create("two")], "atomic": True},
+    )
+
+    assert response.json()["committed"] is True
+    todos = client.get("/todos/", headers=headers).json()["todos"]
+    assert sorted(todo["title"] for todo in todos) == ["one", "two"]
+
+
+def test_atomic_batch_rolls_back_on_failure(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        route,
+        headers=headers,
+        json={
+            "requests": [
+                create("one"),
+                {"method": "DELETE", "path": "/todos/99"},
+                create("never"),
+            ],
+            "atomic": True,
+        },
+    )
+
+    result = response.json()
+    assert result["committed"] is False
+    assert [item["status"] for item in result["responses"]] == [
+        HTTPStatus.OK,
+        HTTPStatus.NOT_FOUND,
+    ]
+    assert client.get("/todos/", headers=headers).json()["todos"] == []
+
+
+def test_atomic_batch_rollback_leaves_no_cached_lists(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        route,
+        headers=headers,
+        json={
+            "requests": [
+                create("phantom"),
+                {"method": "GET", "path": "/todos/"},
+                {"method": "DELETE", "path": "/todos/99"},
+            ],
+            "atomic": True,
+        },
+    )
+
+    result = response.json()
+    assert result["committed"] is False
+    assert len(result["responses"][1]["body"]["todos"]) == 1
+    assert client.get("/todos/", headers=headers).json()["todos"] == []
+
+
+def test_atomic_batch_rollback_leaves_no_cached_user(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        route,
+        headers=headers,
+        json={
+            "requests": [
+                {"method": "POST", "path": "/auth/revoke"},
+                {"method": "GET", "path": "/todos/99"},
+            ],
+            "atomic": True,
+        },
+    )
+
+    assert response.json()["committed"] is False
+    response = client.post("/auth/refresh_token", headers=headers)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_batch_cant_be_nested(client, token):
+    response = client.post(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        json={"requests": [{"method": "POST", "path": "/batch"}]},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_batch_refuses_the_change_feed(client, token):
+    response = client.post(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        json={"requests": [{"method": "GET", "path": "/todos/changes"}]},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {"detail": "The change feed can't be batched"}
+
+
+def test_batch_refuses_streaming_responses(client, todo, token):
+    response = client.post(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "requests": [
+                {"method": "GET", "path": "/todos/export"},
+                {"method": "GET", "path": f"/todos/{todo['id']}"},
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    export, read = response.json()["responses"]
+    assert export["status"] == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert export["body"] == {
+        "detail": "Streaming responses can't be batched"
+    }
+    assert read["status"] == HTTPStatus.OK
+
+
+def test_batch_size_is_limited(client, token):
+    response = client.post(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "requests": [{"method": "GET", "path": "/todos/1"}]
+            * (BATCH_MAX_REQUESTS + 1)
+        },
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_batch_requires_authentication(client):
+    response = client.post(
+        route, json={"requests": [{"method": "GET", "path": "/todos/1"}]}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_batch_continues_after_a_failed_write(
+    client, user, another_user, token
+):
+    response = client.post(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "requests": [
+                {
+                    "method": "PUT",
+                    "path": f"/users/{user.id}",
+                    "body": {
+                        "username": user.username,
+                        "email": another_user.email,
+                        "password": "secret",
+                    },
+                },
+                {"method": "GET", "path": "/todos/"},
+            ]
+        },
+    )
+
+    assert [item["status"] for item in response.json()["responses"]] == [
+        HTTPStatus.CONFLICT,
+        HTTPStatus.OK,
+    ]
+
+
+def test_batch_logs_unhandled_errors(client, token, caplog):
+    def broken_session():
+        raise RuntimeError("database down")
+
+    app.dependency_overrides[get_read_session] = broken_session
+
+    with caplog.at_level(logging.ERROR, logger="fast_zero.batch"):
+        response = client.post(
+            route,
+            headers={"Authorization": f"Bearer {token}"},
+            json={"requests": [{"method": "GET", "path": "/todos/"}]},
+        )
+
+    result = response.json()["responses"][0]
+    assert result["status"] == HTTPStatus.INTERNAL_SERVER_ERROR
+    [record] = caplog.records
+    assert record.message == "Unhandled error in batched GET /todos/"
+    assert record.exc_info[0] is RuntimeError
@@ -0,0 +1,23 @@
+from fast_zero.calibrate import MIN_MEMORY_COST, calibrate, main
+
+
+def fake_measure(time_cost, memory_cost, parallelism):
+    # 10 ms per pass over 64 MiB.
+    return 0.01 * time_cost * memory_cost / 65_536
+
+
+def test_calibrate_adds_passes_up_to_the_target():
+    expected_time_cost = 5
+    assert calibrate(0.05, measure=fake_measure) == (expected_time_cost, 65_536)
+
+
+def test_calibrate_lowers_memory_when_one_pass_is_too_slow():
+    assert calibrate(0.004, measure=fake_measure) == (1, MIN_MEMORY_COST)
+
+
+def test_calibrate_prints_settings(capsys):
+    main(["--target-ms", "1", "--memory-cost", str(MIN_MEMORY_COST)])
+
+    output = capsys.readouterr().out
+    assert "ARGON2_TIME_COST=1\n" in output
+    assert f"ARGON2_MEMORY_COST={MIN_MEMORY_COST}\n" in output
@@ -0,0 +1,231 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.app import app
+from fast_zero.changes import (
+    RESYNC,
+    MemoryBroker,
+    PostgresBroker,
+    Subscription,
+    get_change_broker,
+    todo_change,
+)
+from fast_zero.routes.todos import _change_events
+
+
+def test_todo_change_resyncs_large_writes():
+    assert todo_change("created", [2, 1]) == {
+        "event": "created",
+        "ids": [1, 2],
+    }
+    assert todo_change("created", None) == RESYNC
+    assert todo_change("deleted", list(range(1_000))) == RESYNC
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_a_resync():
+    subscription = Subscription(max_size=2)
+
+    for todo_id in range(5):
+        subscription.deliver(todo_change("updated", [todo_id]))
+
+    assert await subscription.get() == RESYNC
+    assert subscription.queue.empty()
+
+    subscription.deliver(todo_change("updated", [9]))
+    assert await subscription.get() == {"event": "updated", "ids": [9]}
+
+
+@pytest.mark.asyncio
+async def test_memory_broker_delivers_on_commit(session):
+    broker = MemoryBroker()
+    change = todo_change("created", [1])
+
+    async with broker.subscribe(1) as subscription:
+        await session.execute(select(1))
+        await broker.publish(session, 1, change)
+        assert subscription.queue.empty()
+
+        await session.commit()
+        assert subscription.queue.get_nowait() == change
+
+        await session.execute(select(1))
+        await broker.publish(session, 1, change)
+        await session.rollback()
+        await session.commit()
+        assert subscription.queue.empty()
+
+    assert broker.subscribers == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("commit", [True, False])
+async def test_memory_broker_waits_for_the_joined_transaction(
+    session, commit
+):
+    broker = MemoryBroker()
+    change = todo_change("created", [1])
+
+    async with broker.subscribe(1) as subscription:
+        async with session.bind.connect() as connection:
+            transaction = await connection.begin()
+            async with AsyncSession(
+                connection, join_transaction_mode="create_savepoint"
+            ) as joined:
+                await joined.execute(select(1))
+                await broker.publish(joined, 1, change)
+                await joined.commit()
+            assert subscription.queue.empty()
+
+            if commit:
+                await transaction.commit()
+            else:
+                await transaction.rollback()
+
+        assert subscription.queue.qsize() == int(commit)
+
+
+@pytest.mark.asyncio
+async def test_postgres_broker_delivers_notifications(session):
+    broker = PostgresBroker(
+        session.bind.url.render_as_string(hide_password=False),
+        channel="test_todo_changes",
+    )
+    change = todo_change("deleted", [3])
+
+    async with broker.subscribe(1) as subscription:
+        await broker.publish(session, 1, change)
+        await broker.publish(session, 2, todo_change("deleted", [4]))
+        await session.commit()
+
+        assert await asyncio.wait_for(subscription.get(), 5) == change
+        assert subscription.queue.empty()
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_postgres_broker_skips_bad_notifications(session):
+    broker = PostgresBroker(
+        session.bind.url.render_as_string(hide_password=False),
+        channel="test_todo_changes",
+    )
+    change = todo_change("deleted", [3])
+
+    async with broker.subscribe(1) as subscription:
+        for payload in ("not json", '{"event": "deleted"}', "[1]"):
+            await session.execute(
+                select(func.pg_notify("test_todo_changes", payload))
+            )
+        await broker.publish(session, 1, change)
+        await session.commit()
+
+        assert await asyncio.wait_for(subscription.get(), 5) == change
+        assert not broker._listener.done()
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_postgres_broker_unavailable():
+    broker = PostgresBroker(
+        "postgresql+psycopg://postgres@127.0.0.1:1/postgres",
+        retry_after=0.01,
+        connect_timeout=0.2,
+    )
+
+    with pytest.raises(HTTPException) as error:
+        await broker.connect()
+
+    assert error.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    # Still retrying in the background.
+    assert not broker._listener.done()
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_change_events_stream():
+    broker = MemoryBroker()
+    events = _change_events(broker, 1)
+
+    assert await anext(events) == b": connected\n\n"
+
+    broker.dispatch(1, todo_change("updated", [7]))
+    assert await anext(events) == (
+        b'event: updated\ndata: {"event":"updated","ids":[7]}\n\n'
+    )
+
+    await events.aclose()
+    assert broker.subscribers == {}
+
+
+@pytest.mark.asyncio
+async def test_todo_writes_publish_changes(client, token):
+    broker = MemoryBroker()
+    app.dependency_overrides[get_change_broker] = lambda: broker
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with broker.subscribe(1) as subscription:
+        todo = client.post(
+            "/todos/",
+            headers=headers,
+            json={"title": "a", "description": "b", "state": "todo"},
+        ).json()
+        client.patch(
+            f"/todos/{todo['id']}", headers=headers, params={"title": "c"}
+        )
+        response = client.delete(f"/todos/{todo['id']}", headers=headers)
+        assert response.status_code == HTTPStatus.OK
+
+        changes = [
+            subscription.queue.get_nowait()
+            for _ in range(subscription.queue.qsize())
+        ]
+
+    assert changes == [
+        {"event": "created", "ids": [todo["id"]]},
+        {"event": "updated", "ids": [todo["id"]]},
+        {"event": "deleted", "ids": [todo["id"]]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_postgres_broker_notifies_from_single_row_writes(
+    client, session, token, count_queries
+):
+    broker = PostgresBroker(
+        session.bind.url.render_as_string(hide_password=False),
+        channel="test_todo_changes",
+    )
+    app.dependency_overrides[get_change_broker] = lambda: broker
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/auth/refresh_token", headers=headers)
+
+    async with broker.subscribe(1) as subscription:
+        with count_queries() as queries:
+            todo = client.post(
+                "/todos/",
+                headers=headers,
+                json={"title": "a", "description": "b", "state": "todo"},
+            ).json()
+            client.patch(
+                f"/todos/{todo['id']}", headers=headers, params={"title": "c"}
+            )
+            client.delete(f"/todos/{todo['id']}", headers=headers)
+
+        changes = [
+            await asyncio.wait_for(subscription.get(), 5) for _ in range(3)
+        ]
+
+    await broker.stop()
+    assert len(queries) == len(changes)
+    assert changes == [
+        {"event": "created", "ids": [todo["id"]]},
+        {"event": "updated", "ids": [todo["id"]]},
+        {"event": "deleted", "ids": [todo["id"]]},
+    ]
@@ -1,10 +1,21 @@
 from dataclasses import asdict
 from datetime import datetime
+from http import HTTPStatus
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
 
-from fast_zero.models import Todo, User
+from fast_zero import database
+from fast_zero.database import (
+    ReplicaRouter,
+    get_read_session,
+    make_engine,
+    pool_stats,
+)
+
+from fast_zero.models import TODO_SEARCH_DOCUMENT, Todo, TodoState, User
 
 
 @pytest.mark.asyncio
@@ -30,16 +41,19 @@ async def test_create_user(session, mock_db_time):
         "password": new_user.password,
         "created_at": time,
         "update_at": time,
+        "todos_version": 0,
+        "token_version": 0,
     }
 
 
 @pytest.mark.asyncio
-async def test_make_todo(session, user):
-    new_todo = Todo(
-        title="test", description="test", state="draft", user_id=user.id
-    )
-    session.add(new_todo)
-    await session.commit()
+async def test_make_todo(session, user, mock_db_time):
+    with mock_db_time(model=Todo) as time:
+        new_todo = Todo(
+            title="test", description="test", state="draft", user_id=user.id
+        )
+        session.add(new_todo)
+        await session.commit()
 
     todo = await session.scalar(
         select(Todo).where(Todo.title == new_todo.title)
@@ -51,4 +65,215 @@ async def test_make_todo(session, user):
         "description": new_todo.description,
         "state": new_todo.state,
         "user_id": user.id,
+        "created_at": time,
+        "updated_at": time,
+        "version": 1,
     }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query, index",
+    [
+        (
+            select(Todo).where(Todo.user_id == 1).order_by(Todo.id).limit(100),
+            "ix_todos_user_id_id",
+        ),
+        (
+            select(Todo)
+            .where(Todo.user_id == 1, Todo.id > 10)
+            .order_by(Todo.id)
+            .limit(100),
+            "ix_todos_user_id_id",
+        ),
+        (
+            select(Todo)
+            .where(Todo.user_id == 1, Todo.state == TodoState.done)
+            .order_by(Todo.id)
+            .limit(100),
+            "ix_todos_user_id_state_id",
+        ),
+    ],
+)
+async def test_todo_queries_use_indexes(session, query, index):
+    n_users, todos_per_user = 50, 200
+    await session.execute(
+        insert(User),
+        [
+            {"username": f"u{n}", "email": f"u{n}@test.com", "password": "x"}
+            for n in range(n_users)
+        ],
+    )
+    await session.execute(
+        insert(Todo),
+        [
+            {
+                "title": "title",
+                "description": "description",
+                "state": list(TodoState)[n % len(TodoState)],
+                "user_id": user_id,
+            }
+            for user_id in range(1, n_users + 1)
+            for n in range(todos_per_user)
+        ],
+    )
+    await session.commit()
+    await session.execute(text("ANALYZE todos"))
+
+    compiled = query.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    plan = await session.scalars(text(f"EXPLAIN {compiled}"))
+
+    assert index in "\n".join(plan.all())
+
+
+@pytest.mark.asyncio
+async def test_todo_search_uses_gin_index(session, user):
+    await session.execute(
+        insert(Todo),
+        [
+            {
+                "title": f"todo {n}",
+                "description": "needle" if n % 1000 == 0 else "haystack",
+                "state": TodoState.todo,
+                "user_id": user.id,
+            }
+            for n in range(10_000)
+        ],
+    )
+    await session.commit()
+    await session.execute(text("ANALYZE todos"))
+
+    plan = await session.scalars(
+        text(
+            f"EXPLAIN SELECT id FROM todos WHERE user_id = {user.id} "
+            f"AND {TODO_SEARCH_DOCUMENT} @@ "
+            "websearch_to_tsquery('simple'::regconfig, 'needle')"
+        )
+    )
+
+    assert "ix_todos_search" in "\n".join(plan.all())
+
+
+@pytest.fixture
+def engine_url(engine):
+    return engine.url.render_as_string(hide_password=False)
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(engine_url):
+    pool_engine = make_engine(engine_url)
+
+    async with pool_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = pool_stats(pool_engine)
+
+    assert stats["checked_out"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["wait_seconds"] >= 0
+    assert pool_stats(pool_engine)["checked_in"] == 1
+
+    await pool_engine.dispose()
+
+
+def test_pool_stats_unavailable_for_sqlite():
+    assert pool_stats(make_engine("sqlite+aiosqlite:///:memory:")) is None
+
+
+@pytest.mark.asyncio
+async def test_engine_statement_timeout(engine_url, monkeypatch):
+    monkeypatch.setenv("DATABASE_STATEMENT_TIMEOUT_MS", "10")
+    pool_engine = make_engine(engine_url)
+
+    async with pool_engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("SELECT pg_sleep(1)"))
+
+    await pool_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_pool_stats(client, engine_url, monkeypatch):
+    pool_engine = make_engine(engine_url)
+    monkeypatch.setattr(database, "engine", pool_engine)
+
+    response = client.get("/health/pool")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["checked_out"] == 0
+
+    await pool_engine.dispose()
+
+
+def test_read_pool_stats_unavailable(client, monkeypatch):
+    monkeypatch.setattr(
+        database, "engine", make_engine("sqlite+aiosqlite:///:memory:")
+    )
+
+    response = client.get("/health/pool")
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+async def read_session_binds(n_sessions):
+    binds = []
+    for _ in range(n_sessions):
+        async for session in get_read_session():
+            binds.append(session.bind)
+    return binds
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_round_robin_replicas(tmp_path, monkeypatch):
+    replicas = [
+        make_engine(f"sqlite+aiosqlite:///{tmp_path}/replica_{n}.db")
+        for n in range(2)
+    ]
+    monkeypatch.setattr(database, "replica_router", ReplicaRouter(replicas))
+
+    binds = await read_session_binds(3)
+
+    assert binds == [replicas[0], replicas[1], replicas[0]]
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_skip_unhealthy_replica(tmp_path, monkeypatch):
+    broken = make_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/db.db")
+    healthy = make_engine(f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+    router = ReplicaRouter([broken, healthy], retry_after=60)
+    monkeypatch.setattr(database, "replica_router", router)
+
+    binds = await read_session_binds(2)
+
+    assert binds == [healthy, healthy]
+    assert router.candidates() == [healthy]
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_fall_back_to_primary(tmp_path, monkeypatch):
+    broken = make_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/db.db")
+    monkeypatch.setattr(database, "replica_router", ReplicaRouter([broken]))
+
+    binds = await read_session_binds(1)
+
+    assert binds == [database.engine]
+
+
+def test_replica_router_retries_after_cooldown():
+    class FakeTimer:
+        now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    timer = FakeTimer()
+    replica = make_engine("sqlite+aiosqlite:///:memory:")
+    router = ReplicaRouter([replica], retry_after=30, timer=timer)
+
+    router.mark_down(replica)
+    assert router.candidates() == []
+
+    timer.now = 30
+    assert router.candidates() == [replica]
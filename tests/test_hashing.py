@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from fast_zero.hashing import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password():
+    hasher = PasswordHasher(workers=1)
+
+    hashed = await hasher.hash("secret")
+
+    assert hashed != "secret"
+    assert await hasher.verify("secret", hashed)
+    assert not await hasher.verify("wrong", hashed)
+
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_metrics():
+    hasher = PasswordHasher(workers=1)
+
+    await hasher.hash("secret")
+    await hasher.hash("secret")
+
+    expected_calls = 2
+    assert hasher.metrics.calls == expected_calls
+    assert hasher.metrics.total_seconds > 0
+    assert hasher.metrics.max_seconds <= hasher.metrics.total_seconds
+    assert hasher.pending == 0
+
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_rejects_when_queue_is_full():
+    hasher = PasswordHasher(workers=1, max_queue=0)
+    hasher.pending = 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.hash("secret")
+
+    assert exc_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert hasher.metrics.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_hash_on_process_pool():
+    hasher = PasswordHasher(executor="process", workers=1)
+
+    hashed = await hasher.hash("secret")
+
+    assert await hasher.verify("secret", hashed)
+
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_verify_and_update_current_hash():
+    hasher = PasswordHasher(workers=1)
+    hashed = await hasher.hash("secret")
+
+    assert await hasher.verify_and_update("secret", hashed) == (True, None)
+    assert await hasher.verify_and_update("wrong", hashed) == (False, None)
+
+    hasher.shutdown()
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+from fast_zero.metrics import (
+    REQUEST_DB_QUERIES,
+    REQUEST_LATENCY,
+    Histogram,
+    instrument_engine,
+)
+from fast_zero.security import user_cache
+
+
+def test_histogram_buckets():
+    histogram = Histogram("latency", "Latency.", (0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, route="/")
+
+    samples = {
+        (name, labels): value for name, labels, value in histogram.samples()
+    }
+    route = (("route", "/"),)
+    expected = {"0.1": 2, "1.0": 3, "+Inf": 4}
+    for bound, count in expected.items():
+        assert samples["latency_bucket", (*route, ("le", bound))] == count
+    assert samples["latency_count", route] == len(expected) + 1
+    assert samples["latency_sum", route] == 0.05 + 0.1 + 0.5 + 2.0
+
+
+def test_metrics_endpoint_reports_route_latency(client):
+    client.get("/")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/",'
+        'status="200"}'
+    ) in response.text
+    assert "password_hash_queue_depth 0" in response.text
+
+
+def test_metrics_use_route_templates(client, todo, token):
+    client.get(
+        f"/todos/{todo['id']}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    client.get("/does-not-exist")
+
+    labels = {dict(key)["route"] for key in REQUEST_LATENCY.values}
+
+    assert "/todos/{todo_id}" in labels
+    assert "<unmatched>" in labels
+    assert f"/todos/{todo['id']}" not in labels
+
+
+def test_metrics_count_queries_per_request(client, engine, todo, token):
+    instrument_engine(engine)
+    key = (("route", "/todos/"),)
+    before = REQUEST_DB_QUERIES.values.get(key, [0.0])[-1]
+
+    user_cache.clear()
+    client.get("/todos/", headers={"Authorization": f"Bearer {token}"})
+
+    # The user lookup in get_current_user and the todo list query.
+    expected_queries = 2
+    assert REQUEST_DB_QUERIES.values[key][-1] - before == expected_queries
+
+
+def test_metrics_export_todos_cache(client, todo, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/todos/", headers=headers)
+    client.get("/todos/", headers=headers)
+
+    body = client.get("/metrics").text
+
+    assert "todos_cache_hits_total " in body
+    assert "todos_cache_hit_ratio " in body
+    assert "todos_cache_bytes " in body
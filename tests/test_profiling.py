@@ -0,0 +1,64 @@
+import json
+import logging
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fast_zero.app import app
+from fast_zero.profiling import (
+    ProfilingMiddleware,
+    QueryProfile,
+    profile_engine,
+)
+from fast_zero.security import user_cache
+
+
+@pytest.fixture
+def profiled_client(client, session):
+    profile_engine(session.bind)
+    return TestClient(ProfilingMiddleware(app, repeat_threshold=2))
+
+
+def test_query_profile_repeated_statements():
+    profile = QueryProfile([("SELECT 1", 0.1), ("SELECT 2", 0.1)] * 2)
+    profile.statements.append(("SELECT 3", 0.2))
+
+    assert profile.repeated(threshold=2) == {"SELECT 1": 2, "SELECT 2": 2}
+    assert profile.seconds == pytest.approx(0.6)
+
+
+def test_profiling_server_timing_header(profiled_client, todo, token):
+    user_cache.clear()
+    response = profiled_client.get(
+        "/todos/", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    server_timing = response.headers["Server-Timing"]
+    assert server_timing.startswith("db;dur=")
+    assert 'desc="2 queries"' in server_timing
+    assert "app;dur=" in server_timing
+
+
+def test_profiling_logs_statements(profiled_client, todo, token, caplog):
+    headers = {"Authorization": f"Bearer {token}"}
+
+    user_cache.clear()
+    with caplog.at_level(logging.INFO, logger="fast_zero.profiling"):
+        profiled_client.get("/todos/", headers=headers)
+        profiled_client.get("/todos/1", headers=headers)
+
+    first, second = (json.loads(r.getMessage()) for r in caplog.records)
+    assert first["route"] == "/todos/"
+    assert first["queries"] == len(first["statements"]) == 2
+    assert first["repeated"] == []
+    assert second["route"] == "/todos/{todo_id}"
+
+
+def test_query_budget_fails_when_exceeded(client, user, token, query_budget):
+    with pytest.raises(pytest.fail.Exception, match="over a budget of 1"):
+        with query_budget(1):
+            client.get(
+                "/todos/", headers={"Authorization": f"Bearer {token}"}
+            )
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from fast_zero.rate_limit import Limit, LoginRateLimiter, MemoryBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(clock, max_concurrent=8):
+    return LoginRateLimiter(
+        MemoryBackend(timer=clock),
+        username_limit=Limit(per_minute=60, burst=2),
+        ip_limit=Limit(per_minute=600, burst=10),
+        max_concurrent=max_concurrent,
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills():
+    clock = FakeClock()
+    backend = MemoryBackend(timer=clock)
+
+    assert await backend.take("key", rate=1, burst=2) == 0
+    assert await backend.take("key", rate=1, burst=2) == 0
+    assert await backend.take("key", rate=1, burst=2) == 1
+
+    clock.now = 1.0
+    assert await backend.take("key", rate=1, burst=2) == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_throttles_by_username():
+    limiter = make_limiter(FakeClock())
+
+    await limiter.check("Test@test.com", "10.0.0.1")
+    await limiter.check("test@test.com", "10.0.0.2")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await limiter.check("test@test.com", "10.0.0.3")
+
+    assert exc_info.value.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert exc_info.value.headers == {"Retry-After": "1"}
+    assert limiter.limited == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_throttles_by_ip():
+    limiter = make_limiter(FakeClock())
+
+    for n in range(10):
+        await limiter.check(f"user{n}@test.com", "10.0.0.1")
+
+    with pytest.raises(HTTPException):
+        await limiter.check("other@test.com", "10.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_concurrent_verifications():
+    limiter = make_limiter(FakeClock(), max_concurrent=1)
+
+    async with limiter.admit():
+        with pytest.raises(HTTPException) as exc_info:
+            async with limiter.admit():
+                pass
+
+    assert exc_info.value.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert limiter.saturated == 1
+    assert limiter.verifying == 0
@@ -0,0 +1,121 @@
+import pytest
+
+from fast_zero.response_cache import (
+    MemoryBackend,
+    ResponseCache,
+    make_backend,
+)
+from fast_zero.settings import Settings
+
+
+class FakeSharedBackend:
+    """
+    Stands in for a store shared by every worker, like Redis: values expire
+    on a fake clock and counters live next to them.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.values: dict[str, tuple[float, bytes]] = {}
+        self.counters: dict[str, int] = {}
+
+    async def get(self, key):
+        expires_at, value = self.values.get(key, (0.0, None))
+        return value if expires_at > self.now else None
+
+    async def set(self, key, value, ttl):
+        self.values[key] = (self.now + ttl, value)
+
+    async def get_counter(self, key):
+        return self.counters.get(key, 0)
+
+    async def incr(self, key):
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    @property
+    def size_bytes(self):
+        return sum(len(value) for _, value in self.values.values())
+
+
+@pytest.mark.asyncio
+async def test_response_cache_hit_and_miss():
+    cache = ResponseCache(MemoryBackend(), namespace="todos", ttl=60)
+    key = await cache.key(1, '{"state": "done"}')
+
+    assert await cache.get(key) is None
+    await cache.set(key, '"etag"', b'{"todos":[]}')
+
+    assert await cache.get(key) == ('"etag"', b'{"todos":[]}')
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_ratio == 0.5
+
+
+@pytest.mark.asyncio
+async def test_response_cache_keys_by_user_and_query():
+    cache = ResponseCache(MemoryBackend(), namespace="todos", ttl=60)
+
+    keys = {
+        await cache.key(1, '{"state": "done"}'),
+        await cache.key(1, '{"state": "todo"}'),
+        await cache.key(2, '{"state": "done"}'),
+    }
+
+    assert len(keys) == 3
+
+
+@pytest.mark.asyncio
+async def test_response_cache_invalidate_across_workers():
+    backend = FakeSharedBackend()
+    worker, other_worker = (
+        ResponseCache(backend, namespace="todos", ttl=60) for _ in range(2)
+    )
+    key = await worker.key(1, "{}")
+    await worker.set(key, '"etag"', b"{}")
+    untouched = await worker.key(2, "{}")
+    await worker.set(untouched, '"etag"', b"{}")
+
+    await other_worker.invalidate(1)
+
+    assert await worker.get(await worker.key(1, "{}")) is None
+    assert await worker.get(await worker.key(2, "{}")) is not None
+
+
+@pytest.mark.asyncio
+async def test_response_cache_entries_expire():
+    backend = FakeSharedBackend()
+    cache = ResponseCache(backend, namespace="todos", ttl=60)
+    key = await cache.key(1, "{}")
+    await cache.set(key, '"etag"', b"{}")
+
+    backend.now = 61
+
+    assert await cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_size_and_eviction():
+    backend = MemoryBackend(max_size=2)
+
+    for key in ("a", "b", "c"):
+        await backend.set(key, b"12345", ttl=60)
+
+    assert await backend.get("a") is None
+    assert backend.size_bytes == 10
+
+
+@pytest.mark.parametrize(
+    ("workers", "max_size"), [(None, 16), (1, 16), (4, 0)]
+)
+def test_memory_backend_only_caches_in_a_single_worker(
+    monkeypatch, workers, max_size
+):
+    monkeypatch.setenv("TODOS_CACHE_MAX_SIZE", "16")
+    if workers is None:
+        monkeypatch.delenv("SERVER_WORKERS", raising=False)
+    else:
+        monkeypatch.setenv("SERVER_WORKERS", str(workers))
+
+    backend = make_backend(Settings())
+
+    assert backend.entries.max_size == max_size
@@ -1,12 +1,21 @@
 from http import HTTPStatus
 
+import pytest
+from freezegun import freeze_time
 from jwt import decode
+from jwt.exceptions import ExpiredSignatureError
 
+from fast_zero import security
 from fast_zero.security import (
     ALGORITHM,
     SECRET_KEY,
     create_acess_token,
+    decode_access_token,
+    make_user_cache,
+    token_cache,
+    user_cache,
 )
+from fast_zero.settings import Settings
 
 
 def test_jwt_decode():
@@ -51,3 +60,140 @@ def test_invalid_user_data(client):
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert response.json() == {"detail": "Could not validate credentials."}
+
+
+def test_token_subject_is_the_user_id(user, token):
+    claims = decode(token, SECRET_KEY, algorithms=ALGORITHM)
+
+    assert claims["sub"] == str(user.id)
+    assert claims["ver"] == user.token_version
+
+
+def test_token_without_version(client, user):
+    token = create_acess_token({"sub": str(user.id)})
+
+    response = client.post(
+        "/auth/refresh_token", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_stateless_auth_skips_the_user_lookup(
+    client, token, todo, count_queries, monkeypatch
+):
+    monkeypatch.setattr(security, "STATELESS_AUTH", True)
+    user_cache.clear()
+
+    with count_queries() as queries:
+        response = client.get(
+            f"/todos/{todo['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(queries) == 1
+    assert "FROM users" not in queries[0]
+
+
+def test_current_user_is_cached(client, user, token):
+    for _ in range(2):
+        response = client.post(
+            "/auth/refresh_token",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    assert user_cache.misses == 1
+    assert user_cache.hits == 1
+
+
+def test_current_user_cache_expires_under_steady_use(
+    client, user, token, monkeypatch
+):
+    clock = {"now": 0.0}
+    monkeypatch.setattr(user_cache, "_timer", lambda: clock["now"])
+
+    for now in (0.0, user_cache.ttl * 0.75, user_cache.ttl * 1.5):
+        clock["now"] = now
+        response = client.post(
+            "/auth/refresh_token",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    assert (user_cache.misses, user_cache.hits) == (2, 1)
+
+
+@pytest.mark.parametrize(
+    ("workers", "max_size"), [(None, 16), (1, 16), (4, 0)]
+)
+def test_user_cache_only_caches_in_a_single_worker(
+    monkeypatch, workers, max_size
+):
+    monkeypatch.setenv("USER_CACHE_MAX_SIZE", "16")
+    if workers is None:
+        monkeypatch.delenv("SERVER_WORKERS", raising=False)
+    else:
+        monkeypatch.setenv("SERVER_WORKERS", str(workers))
+
+    assert make_user_cache(Settings()).max_size == max_size
+
+
+def test_current_user_cache_invalidated_on_update(client, user, token):
+    client.post(
+        "/auth/refresh_token", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    response = client.put(
+        f"/users/{user.id}",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "username": "changed",
+            "email": "changed@test.com",
+            "password": "changed",
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.post(
+        "/auth/refresh_token", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_current_user_cache_invalidated_on_delete(client, user, token):
+    response = client.delete(
+        f"/users/{user.id}", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.post(
+        "/auth/refresh_token", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_decode_access_token_is_cached():
+    token_cache.clear()
+    token = create_acess_token({"sub": "test@test.com"})
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first == second
+    assert token_cache.misses == 1
+    assert token_cache.hits == 1
+
+
+def test_cached_token_expires():
+    token_cache.clear()
+    with freeze_time("2025-01-01 00:00:00"):
+        token = create_acess_token({"sub": "test@test.com"})
+        decode_access_token(token)
+
+    with freeze_time("2025-01-08 00:00:00"):
+        with pytest.raises(ExpiredSignatureError):
+            decode_access_token(token)
+
+    assert len(token_cache) == 0
@@ -0,0 +1,39 @@
+from fast_zero import serve
+from fast_zero.settings import Settings
+
+
+def test_server_options_default_to_one_worker_per_cpu(monkeypatch):
+    monkeypatch.setattr(serve.os, "sched_getaffinity", lambda pid: {0, 1, 2})
+
+    options = serve.server_options(Settings())
+
+    expected_workers = 3
+    assert options["workers"] == expected_workers
+    assert options["loop"] == "uvloop"
+    assert options["http"] == "httptools"
+    assert options["access_log"] is False
+
+
+def test_server_options_use_settings(monkeypatch):
+    monkeypatch.setenv("SERVER_WORKERS", "2")
+    monkeypatch.setenv("SERVER_PORT", "9000")
+
+    options = serve.server_options(Settings())
+
+    expected_workers, expected_port = 2, 9000
+    assert options["workers"] == expected_workers
+    assert options["port"] == expected_port
+
+
+def test_main_runs_the_app_under_uvicorn(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        serve.uvicorn, "run", lambda app, **options: calls.append(app)
+    )
+    monkeypatch.setattr(serve.os, "sched_getaffinity", lambda pid: {0, 1, 2})
+    monkeypatch.setenv("SERVER_WORKERS", "0")
+
+    serve.main()
+
+    assert calls == ["fast_zero.app:app"]
+    assert serve.os.environ["SERVER_WORKERS"] == "3"
@@ -1,9 +1,18 @@
-from dataclasses import asdict
+import csv
+import io
+import json
 from http import HTTPStatus
 from typing import Any
 
 import pytest
 
+from fast_zero import database
+from fast_zero.database import ReplicaRouter
+from fast_zero.models import TodoState
+from fast_zero.response_cache import todos_cache
+from fast_zero.routes import todos
+from fast_zero.schemas import TodoList, TodoPublic
+from fast_zero.types.types_app import TODOS_BULK_MAX_SIZE
 from tests.factories import TodoFactory
 
 route = "/todos"
@@ -31,6 +40,32 @@ def test_create_todo(client, user, token):
     assert response.json() == {"id": 1, "user_id": user.id, **todo}
 
 
+def test_create_todo_round_trips(client, user, token, count_queries):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/auth/refresh_token", headers=headers)
+
+    with count_queries() as queries:
+        response = client.post(
+            route,
+            headers=headers,
+            json={"title": "test", "description": "test", "state": "draft"},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(queries) == 1
+    assert "INSERT INTO todos" in queries[0]
+
+
+def test_todo_reads_query_budget(client, todo, token, query_budget):
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with query_budget(1):
+        client.get(f"{route}/{todo['id']}", headers=headers)
+
+    with query_budget(1):
+        client.get(route, headers=headers, params={"state": todo["state"]})
+
+
 @pytest.mark.asyncio
 async def test_get_todo_nonexistent(client, session, todo, token):
     response = client.get(
@@ -58,7 +93,42 @@ async def test_todos_content_are_identical(client, session, user, token):
 
     assert response.status_code == HTTPStatus.OK
     assert len(created_todos) == n_factories
-    assert created_todos == [asdict(t) for t in todo]
+    assert created_todos == [
+        TodoPublic.model_validate(t, from_attributes=True).model_dump(
+            mode="json"
+        )
+        for t in todo
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_todos_matches_validated_json(client, session, user, token):
+    todos = create_todos_factory(user_id=user.id, n_factories=3)
+    todos[0].title = "caf\u00e9 \u2615"
+    todos[1].description = 'a "quoted" \\ back\\slash\ttab'
+    session.add_all(todos)
+    await session.commit()
+
+    response = client.get(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        params={"limit": 3},
+    )
+    validated = TodoList(
+        todos=[
+            TodoPublic.model_validate(t, from_attributes=True) for t in todos
+        ],
+        next_cursor=response.json()["next_cursor"],
+    )
+
+    assert (
+        response.content
+        == json.dumps(
+            validated.model_dump(mode="json"),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+    )
 
 
 @pytest.mark.asyncio
@@ -165,6 +235,30 @@ async def test_update_todo(client, todo, token, filter_name, filter_value):
     assert updated_todo[filter_name] == filter_value
 
 
+def test_update_todo_round_trips(client, todo, token, count_queries):
+    with count_queries() as queries:
+        response = client.patch(
+            f"{route}/{todo['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+            params={"title": "updated"},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {**todo, "title": "updated"}
+    assert len(queries) == 1
+    assert "UPDATE todos" in queries[0]
+
+
+def test_update_todo_without_changes(client, todo, token):
+    response = client.patch(
+        f"{route}/{todo['id']}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == todo
+
+
 @pytest.mark.asyncio
 async def test_update_todo_nonexistent(client, token):
     response = client.patch(
@@ -184,6 +278,30 @@ async def test_delete_todo(client, todo, token):
     assert response.status_code == HTTPStatus.OK
 
 
+def test_delete_todo_round_trips(client, todo, token, count_queries):
+    with count_queries() as queries:
+        response = client.delete(
+            f"{route}/{todo['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(queries) == 1
+    assert "DELETE FROM todos" in queries[0]
+
+
+def test_delete_todo_of_another_user(client, session, another_user, token):
+    session.add_all(create_todos_factory(user_id=another_user.id))
+
+    response = client.delete(
+        f"{route}/1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {"detail": "Todo not found"}
+
+
 @pytest.mark.asyncio
 async def test_delete_todo_nonexistent(client, token):
     response = client.delete(
@@ -221,3 +339,513 @@ async def test_filter_combined(client, session, user, token):
 
     assert response.status_code == HTTPStatus.OK
     assert len(response.json()["todos"]) == n_factories
+
+
+@pytest.mark.asyncio
+async def test_list_todos_with_cursor(client, session, user, token):
+    session.add_all(create_todos_factory(user_id=user.id, n_factories=5))
+    await session.commit()
+
+    ids = []
+    params = {"limit": 2}
+    while True:
+        response = client.get(
+            route,
+            headers={"Authorization": f"Bearer {token}"},
+            params=params,
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        page = response.json()
+        ids.extend(todo["id"] for todo in page["todos"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert ids == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_list_todos_invalid_cursor(client, token):
+    response = client.get(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        params={"cursor": "not-a-cursor"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+@pytest.mark.asyncio
+async def test_search_todos_ranks_best_match_first(
+    client, session, user, token
+):
+    session.add_all([
+        *create_todos_factory(
+            user_id=user.id, title="buy bread", description="bakery"
+        ),
+        *create_todos_factory(
+            user_id=user.id, title="buy milk", description="and more milk"
+        ),
+        *create_todos_factory(
+            user_id=user.id, title="call mom", description="sunday"
+        ),
+    ])
+    await session.commit()
+
+    response = client.get(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        params={"q": "buy milk"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [t["title"] for t in response.json()["todos"]] == ["buy milk"]
+
+    response = client.get(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        params={"q": "buy or milk"},
+    )
+
+    assert [t["title"] for t in response.json()["todos"]] == [
+        "buy milk",
+        "buy bread",
+    ]
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_todos_with_cursor(client, token):
+    response = client.get(
+        route,
+        headers={"Authorization": f"Bearer {token}"},
+        params={"q": "milk", "cursor": "MQ=="},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_create_todos_bulk(client, user, token):
+    todos = [
+        {"title": f"todo {n}", "description": "bulk", "state": "todo"}
+        for n in range(3)
+    ]
+
+    response = client.post(
+        f"{route}/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json=todos,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        "todos": [
+            {"id": n + 1, "user_id": user.id, **todo}
+            for n, todo in enumerate(todos)
+        ],
+        "not_found": [],
+    }
+
+
+def test_create_todos_bulk_over_max_size(client, token):
+    todos = [{"title": "todo", "description": "bulk", "state": "todo"}] * (
+        TODOS_BULK_MAX_SIZE + 1
+    )
+
+    response = client.post(
+        f"{route}/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json=todos,
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_update_todos_bulk(client, session, user, another_user, token):
+    session.add_all(create_todos_factory(user_id=user.id, n_factories=2))
+    session.add_all(create_todos_factory(user_id=another_user.id))
+    await session.commit()
+
+    response = client.patch(
+        f"{route}/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json=[
+            {"id": 1, "title": "first"},
+            {"id": 2, "state": "done"},
+            {"id": 3, "title": "not mine"},
+            {"id": 10, "title": "missing"},
+        ],
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    result = response.json()
+    assert [todo["id"] for todo in result["todos"]] == [1, 2]
+    assert result["todos"][0]["title"] == "first"
+    assert result["todos"][1]["state"] == "done"
+    assert result["not_found"] == [3, 10]
+
+
+@pytest.mark.asyncio
+async def test_delete_todos_bulk(client, session, user, another_user, token):
+    session.add_all(create_todos_factory(user_id=user.id, n_factories=2))
+    session.add_all(create_todos_factory(user_id=another_user.id))
+    await session.commit()
+
+    response = client.request(
+        "DELETE",
+        f"{route}/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"ids": [1, 2, 3, 10]},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"deleted": [1, 2], "not_found": [3, 10]}
+
+
+@pytest.mark.asyncio
+async def test_export_todos_ndjson(
+    client, session, user, another_user, token, monkeypatch
+):
+    monkeypatch.setattr(todos, "EXPORT_BATCH_SIZE", 2)
+    session.add_all([
+        *create_todos_factory(user_id=user.id, n_factories=5, state="done"),
+        *create_todos_factory(user_id=user.id, n_factories=2, state="todo"),
+        *create_todos_factory(user_id=another_user.id, state="done"),
+    ])
+    await session.commit()
+
+    response = client.get(
+        f"{route}/export",
+        headers={"Authorization": f"Bearer {token}"},
+        params={"state": "done"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [1, 2, 3, 4, 5]
+    assert list(lines[0]) == list(TodoPublic.model_fields)
+    assert {line["state"] for line in lines} == {"done"}
+
+
+@pytest.mark.asyncio
+async def test_export_todos_csv(client, session, user, token):
+    session.add_all(
+        create_todos_factory(
+            user_id=user.id,
+            title="a, b",
+            description='"c"',
+            state=TodoState.draf,
+        )
+    )
+    await session.commit()
+
+    response = client.get(
+        f"{route}/export",
+        headers={"Authorization": f"Bearer {token}"},
+        params={"format": "csv"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert list(csv.DictReader(io.StringIO(response.text))) == [
+        {
+            "title": "a, b",
+            "description": '"c"',
+            "state": "draft",
+            "id": "1",
+            "user_id": str(user.id),
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_todos_ndjson(client, user, token, monkeypatch):
+    monkeypatch.setattr(todos, "IMPORT_BATCH_SIZE", 2)
+    body = "\n".join([
+        '{"title": "one", "description": "1", "state": "todo"}',
+        '{"title": "two", "description": "2", "state": "done"}',
+        "",
+        '{"title": "three", "state": "done"}',
+        "not json",
+        '{"title": "four", "description": "4", "state": "draft"}\n',
+    ])
+
+    response = client.post(
+        f"{route}/import",
+        headers={"Authorization": f"Bearer {token}"},
+        content=body,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    summary = response.json()
+    assert summary["imported"] == 3
+    assert summary["failed"] == 2
+    assert [error["row"] for error in summary["errors"]] == [3, 4]
+    assert summary["errors"][0]["detail"] == "description: Field required"
+
+    response = client.get(
+        f"{route}/export", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert [
+        json.loads(line)["title"] for line in response.text.splitlines()
+    ] == [
+        "one",
+        "two",
+        "four",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_todos_csv(client, user, token):
+    body = (
+        "title,description,state\r\n"
+        'multi,"first line\r\nsecond, ""line""",todo\r\n'
+        "bad,state,unknown\r\n"
+        "plain,text,doing"
+    )
+
+    response = client.post(
+        f"{route}/import",
+        headers={"Authorization": f"Bearer {token}"},
+        params={"format": "csv"},
+        content=body,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (2, 1)
+    assert summary["errors"][0]["row"] == 2
+
+    response = client.get(
+        f"{route}/export", headers={"Authorization": f"Bearer {token}"}
+    )
+    todos_by_title = {
+        todo["title"]: todo
+        for todo in map(json.loads, response.text.splitlines())
+    }
+    assert todos_by_title["multi"]["description"] == (
+        'first line\nsecond, "line"'
+    )
+    assert todos_by_title["plain"]["state"] == "doing"
+
+
+@pytest.mark.asyncio
+async def test_import_todos_csv_bare_quotes(client, user, token):
+    body = (
+        "title,description,state\n"
+        '24" monitor,buy,todo\n'
+        "cable,buy,todo\n"
+        f"long,{'x' * 50},todo\n"
+        "desk,buy,done\n"
+    )
+
+    field_size_limit = csv.field_size_limit(20)
+    try:
+        response = client.post(
+            f"{route}/import",
+            headers={"Authorization": f"Bearer {token}"},
+            params={"format": "csv"},
+            content=body,
+        )
+    finally:
+        csv.field_size_limit(field_size_limit)
+
+    assert response.status_code == HTTPStatus.OK
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (3, 1)
+    assert summary["errors"][0]["row"] == 3
+    assert summary["errors"][0]["detail"].startswith("row: field larger")
+
+
+@pytest.mark.asyncio
+async def test_import_todos_csv_caps_records(
+    client, user, token, monkeypatch
+):
+    monkeypatch.setattr(todos, "IMPORT_MAX_RECORD_SIZE", 100)
+    body = (
+        "title,description,state\n"
+        'runaway,"never closed,todo\n'
+        + "filler,line,todo\n" * 10
+        + 'last,"closes"",todo\n'
+    )
+
+    response = client.post(
+        f"{route}/import",
+        headers={"Authorization": f"Bearer {token}"},
+        params={"format": "csv"},
+        content=body,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    summary = response.json()
+    assert summary["errors"][0] == {
+        "row": 1,
+        "detail": "row: record longer than 100 characters",
+    }
+
+
+def test_get_todo_conditional(client, todo, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get(f"{route}/{todo['id']}", headers=headers)
+    etag = response.headers["etag"]
+
+    assert response.headers["last-modified"].endswith(" GMT")
+
+    response = client.get(
+        f"{route}/{todo['id']}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert not response.content
+
+    client.patch(
+        f"{route}/{todo['id']}", headers=headers, params={"title": "new"}
+    )
+    response = client.get(
+        f"{route}/{todo['id']}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "new"
+
+
+def test_get_todo_if_modified_since(client, todo, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get(f"{route}/{todo['id']}", headers=headers)
+
+    response = client.get(
+        f"{route}/{todo['id']}",
+        headers={
+            **headers,
+            "If-Modified-Since": response.headers["last-modified"],
+        },
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = client.get(
+        f"{route}/{todo['id']}",
+        headers={
+            **headers,
+            "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT",
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_list_todos_conditional(client, todo, token, count_queries):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get(route, headers=headers)
+    etag = response.headers["etag"]
+    todos_cache.backend.clear()
+
+    with count_queries() as queries:
+        response = client.get(
+            route, headers={**headers, "If-None-Match": etag}
+        )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert len(queries) == 1
+    assert "todos_version" in queries[0]
+
+    response = client.get(
+        route, headers={**headers, "If-None-Match": etag}, params={"limit": 1}
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "kwargs"),
+    [
+        (
+            "post",
+            "",
+            {"json": {"title": "t", "description": "d", "state": "todo"}},
+        ),
+        (
+            "post",
+            "/bulk",
+            {"json": [{"title": "t", "description": "d", "state": "todo"}]},
+        ),
+        ("patch", "/1", {"params": {"title": "t"}}),
+        ("patch", "/bulk", {"json": [{"id": 1, "title": "t"}]}),
+        ("delete", "/1", {}),
+        ("request", "/bulk", {"method": "DELETE", "json": {"ids": [1]}}),
+        (
+            "post",
+            "/import",
+            {"content": '{"title": "t", "description": "d", "state": "todo"}'},
+        ),
+    ],
+)
+def test_todo_writes_change_list_etag(
+    client, todo, token, method, path, kwargs
+):
+    headers = {"Authorization": f"Bearer {token}"}
+    etag = client.get(route, headers=headers).headers["etag"]
+
+    if method == "request":
+        response = client.request(
+            url=f"{route}{path}", headers=headers, **kwargs
+        )
+    else:
+        response = getattr(client, method)(
+            f"{route}{path}", headers=headers, **kwargs
+        )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.get(route, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["etag"] != etag
+
+
+def test_list_todos_served_from_cache(client, todo, token, count_queries):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get(
+        route, headers=headers, params={"state": todo["state"]}
+    )
+
+    with count_queries() as queries:
+        cached = client.get(
+            route, headers=headers, params={"state": todo["state"]}
+        )
+        revalidated = client.get(
+            route,
+            headers={**headers, "If-None-Match": response.headers["etag"]},
+            params={"state": todo["state"]},
+        )
+
+    assert queries == []
+    assert cached.content == response.content
+    assert cached.headers["etag"] == response.headers["etag"]
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_list_todos_read_from_a_replica_are_not_cached(
+    client, session, todo, token, monkeypatch
+):
+    monkeypatch.setattr(
+        database, "replica_router", ReplicaRouter([session.bind])
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    hits = todos_cache.hits
+
+    for _ in range(2):
+        response = client.get(route, headers=headers)
+        assert response.status_code == HTTPStatus.OK
+
+    assert todos_cache.hits == hits
+
+
+def test_todo_write_invalidates_cached_lists(client, todo, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get(route, headers=headers)
+
+    client.patch(
+        f"{route}/{todo['id']}", headers=headers, params={"title": "new"}
+    )
+    response = client.get(route, headers=headers)
+
+    assert [t["title"] for t in response.json()["todos"]] == ["new"]
@@ -1,6 +1,7 @@
+import json
 from http import HTTPStatus
 
-from fast_zero.schemas import UserPublic
+from fast_zero.schemas import UserList, UserPublic
 
 route = "/users"
 
@@ -18,6 +19,28 @@ def test_create_user_returns_201(client):
     assert response.status_code == HTTPStatus.CREATED
 
 
+def test_create_user_round_trips(client, count_queries):
+    with count_queries() as queries:
+        response = client.post(
+            route,
+            json={
+                "username": "test",
+                "email": "test@test.com",
+                "password": "test",
+            },
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json() == {
+        "id": 1,
+        "username": "test",
+        "email": "test@test.com",
+    }
+    # The uniqueness check and the INSERT ... RETURNING, no refresh.
+    expected_queries = 2
+    assert len(queries) == expected_queries
+
+
 def test_username_already_exist(client, user):
     response = client.post(
         route,
@@ -48,14 +71,49 @@ def test_get_users(client):
     response = client.get(route)
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {"users": []}
+    assert response.json() == {"users": [], "next_cursor": None}
 
 
 def test_get_user_created(client, user):
     user_schema = UserPublic.model_validate(user).model_dump()
     response = client.get(route)
 
-    assert response.json() == {"users": [user_schema]}
+    assert response.json() == {
+        "users": [user_schema],
+        "next_cursor": None,
+    }
+
+
+def test_get_users_matches_validated_json(client, user, another_user):
+    response = client.get(route)
+    validated = UserList(
+        users=[
+            UserPublic.model_validate(user),
+            UserPublic.model_validate(another_user),
+        ]
+    )
+
+    assert (
+        response.content
+        == json.dumps(
+            validated.model_dump(mode="json"),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+    )
+
+
+def test_get_users_with_cursor(client, user, another_user):
+    response = client.get(route, params={"limit": 1})
+    first_page = response.json()
+
+    response = client.get(
+        route, params={"limit": 1, "cursor": first_page["next_cursor"]}
+    )
+    second_page = response.json()
+
+    assert first_page["users"][0]["id"] == user.id
+    assert second_page["users"][0]["id"] == another_user.id
 
 
 def test_update_user(client, user, token):
@@ -70,6 +128,52 @@ def test_update_user(client, user, token):
     assert response.json() == user_schema
 
 
+def test_update_user_keeps_tokens_unless_the_password_changes(
+    client, user, token
+):
+    headers = {"Authorization": f"Bearer {token}"}
+    profile = {"email": user.email, "password": user.clean_password}
+
+    response = client.put(
+        f"{route}/{user.id}",
+        headers=headers,
+        json={**profile, "username": "renamed"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    response = client.post("/auth/refresh_token", headers=headers)
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.put(
+        f"{route}/{user.id}",
+        headers=headers,
+        json={**profile, "username": "renamed", "password": "changed"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    response = client.post("/auth/refresh_token", headers=headers)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_update_user_round_trips(client, user, token, count_queries):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/auth/refresh_token", headers=headers)
+
+    with count_queries() as queries:
+        response = client.put(
+            f"{route}/{user.id}",
+            headers=headers,
+            json={
+                "username": "changed",
+                "email": "changed@test.com",
+                "password": "changed",
+            },
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["username"] == "changed"
+    assert len(queries) == 1
+    assert queries[0].startswith("UPDATE users")
+
+
 def test_update_without_permission(client, user, token):
     user_schema = UserPublic.model_validate(user).model_dump()
     response = client.put(